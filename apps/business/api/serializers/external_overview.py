@@ -1,4 +1,4 @@
-from django.db.models import Count
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 from libs.django_cities_light.api.serializers import (
     CitySerializer,
@@ -98,6 +98,31 @@ class LeadAndClientSerializer(serializers.Serializer):
         read_only=True
     )
 
+    @staticmethod
+    def setup_eager_loading(instances, mediator):
+        """ Загрузите связи контактов пачкой перед сериализацией списка.
+        Дела и конвертированные лиды клиентов ограничиваются адвокатом,
+        поэтому `get_type` и `get_matters_count` не делают запросов.
+        """
+        prefetch_related_objects(
+            [obj for obj in instances if isinstance(obj, Client)],
+            Prefetch(
+                'matters',
+                queryset=Matter.objects.filter(mediator=mediator)
+            ),
+            Prefetch(
+                'leads',
+                queryset=models.Lead.objects.filter(
+                    status=models.Lead.STATUS_CONVERTED, mediator=mediator
+                )
+            ),
+        )
+        prefetch_related_objects(
+            [obj for obj in instances if isinstance(obj, Invite)],
+            'matters'
+        )
+        return instances
+
     def get_first_name(self, obj):
         if isinstance(obj, Invite):
             return obj.first_name
@@ -590,10 +615,10 @@ class EnterpriseDetailedOverviewSerializer(EnterpriseSerializer):
             Сериализуем IDs чатов фирмы
             с лидами и возможностями.
         """
-        chats = Chats.objects.annotate(msg_count=Count('messages')).filter(
-            msg_count__gt=0
-        ).prefetch_related(
-            'messages', 'participants'
+        chats = Chats.objects.filter(
+            messages__isnull=False
+        ).distinct().prefetch_related(
+            'participants'
         )
         data = ChatOverviewSerializer(
             chats,
@@ -232,7 +232,7 @@ class MatterSerializer(BaseSerializer):
         required=False
     )
     fee_type = serializers.PrimaryKeyRelatedField(
-        queryset=FeeKind.objects.all(),
+        queryset=FeeKind.objects.cache(),
         required=False
     )
     rate_type = FeeKindSerializer(
@@ -791,7 +791,7 @@ class ShareMatterSerializer(serializers.Serializer):
 
         existing = [
             email for email in emails if
-            AppUser.objects.filter(email__iexact=email).exists()
+            AppUser.objects.filter(email=email.lower()).exists()
         ]
         if existing:
             raise ValidationError(
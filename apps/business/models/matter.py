@@ -23,6 +23,11 @@ __all__ = (
     'Matter',
 )
 
+# статусы вынесены на уровень модуля, чтобы использовать их в условиях
+# частичных индексов: вложенный `Meta` не видит атрибуты модели
+LEAD_STATUS_ACTIVE = 'active'
+MATTER_STATUS_OPEN = 'open'
+
 
 def create_matter_code():
     return ''.join(
@@ -82,6 +87,11 @@ class Opportunity(BaseModel):
     )
     objects = OpportunityQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=('client', 'mediator',)),
+        ]
+
 
 class Lead(BaseModel):
     """ Активный чат (контакт) между адвокатом и клиентом
@@ -157,7 +167,7 @@ class Lead(BaseModel):
         unique=True,
     )
 
-    STATUS_ACTIVE = 'active'
+    STATUS_ACTIVE = LEAD_STATUS_ACTIVE
     STATUS_CONVERTED = 'converted'
 
     STATUS_CHOICES = (
@@ -178,6 +188,15 @@ class Lead(BaseModel):
         verbose_name = _('Lead')
         verbose_name_plural = _('Leads')
         unique_together = ('client', 'mediator')
+        indexes = [
+            # контакты адвоката выбираются по адвокату, а не по клиенту
+            models.Index(fields=('mediator', 'client',)),
+            models.Index(
+                fields=('mediator',),
+                condition=Q(status=LEAD_STATUS_ACTIVE),
+                name='lead_active_mediator_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'Chat between {self.client} and {self.mediator}'
@@ -231,7 +250,7 @@ class Matter(BaseModel):
 
     # ЗАДАЧА: уточнить ограничения на обновления статусов
     # переход к статусам осуществляется с помощью простых кнопок на стороне интерфейса
-    STATUS_OPEN = 'open'
+    STATUS_OPEN = MATTER_STATUS_OPEN
     STATUS_REFERRAL = 'referral'
     STATUS_CLOSE = 'close'
 
@@ -421,6 +440,15 @@ class Matter(BaseModel):
         verbose_name = _('Matter')
         verbose_name_plural = _('Matters')
         unique_together = ['mediator', 'code']
+        indexes = [
+            # контакты адвоката выбираются по адвокату, а не по клиенту
+            models.Index(fields=('mediator', 'client',)),
+            models.Index(
+                fields=('mediator',),
+                condition=Q(status=MATTER_STATUS_OPEN),
+                name='matter_open_mediator_idx',
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=Q(client__isnull=False) | Q(invite__isnull=False),
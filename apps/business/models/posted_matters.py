@@ -335,3 +335,10 @@ class Proposal(BaseModel):
         default=False,
         verbose_name=_('Hidden for mediator')
     )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('mediator', 'status', 'is_hidden_for_mediator',)
+            ),
+        ]
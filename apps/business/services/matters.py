@@ -6,7 +6,7 @@ from django.db.models.expressions import Func
 from ...business import models
 from ...documents.models import Folder
 from ...users.models import AppUser, Invite
-from ...users.utils import send_invitation
+from ...users.utils import send_invitations
 
 
 def get_matter_shared_folder(matter: models.Matter) -> Folder:
@@ -56,10 +56,9 @@ def share_matter_by_invite(
             user_type=Invite.USER_TYPE_MEDIATOR
         ) for email in emails
     )
-    # call `send_invitation` for each created invite cause `post_save` signal
-    # is not called on bulk action
-    for invite in invites:
-        send_invitation(invite)
+    # send invitations manually cause `post_save` signal is not called on
+    # bulk action
+    send_invitations(invites)
 
 
 def share_matter_with_users(
@@ -1,22 +1,46 @@
 from datetime import datetime
 
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
 from ...business import models, services
 from ...users.models import Mediator
 
 
+def _count_subquery(queryset):
+    """Build subquery which counts `queryset` rows per mediator."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values('mediator').annotate(
+                count=Count('pk')
+            ).values('count'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
 def get_mediator_statistics(mediator: Mediator) -> dict:
-    """Get mediator statistics for business app."""
-    active_leads_count = mediator.leads.filter(
-        status=models.Lead.STATUS_ACTIVE
-    ).count()
-    active_matters_count = mediator.matters.filter(
-        status=models.Matter.STATUS_OPEN
-    ).count()
+    """Get mediator statistics for business app.
 
-    return {
-        'active_leads_count': active_leads_count,
-        'active_matters_count': active_matters_count,
-    }
+    All counts are calculated in one query with a subquery per count, so
+    that joins of leads and matters don't multiply each other's rows.
+
+    """
+    return Mediator.objects.filter(pk=mediator.pk).values(
+        active_leads_count=_count_subquery(
+            models.Lead.objects.filter(
+                mediator=OuterRef('pk'),
+                status=models.Lead.STATUS_ACTIVE
+            )
+        ),
+        active_matters_count=_count_subquery(
+            models.Matter.objects.filter(
+                mediator=OuterRef('pk'),
+                status=models.Matter.STATUS_OPEN
+            )
+        ),
+    ).get()
 
 
 def get_mediator_period_statistic(
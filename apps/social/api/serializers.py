@@ -220,9 +220,12 @@ class ChatOverviewSerializer(ChatSerializer):
         ).data
 
     def get_client_data(self, obj):
-        clients = obj.participants.exclude(
-            id=self.context['request'].user.id
-        )
+        # фильтруем в python, чтобы использовать загруженных участников
+        user_id = self.context['request'].user.id
+        clients = [
+            participant for participant in obj.participants.all()
+            if participant.id != user_id
+        ]
         return AppUserWithoutTypeSerializer(
             clients,
             many=True
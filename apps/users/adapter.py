@@ -34,6 +34,10 @@ class AccountAdapter(DefaultAccountAdapter):
     def format_email_subject(self, subject):
         return subject
 
+    def clean_email(self, email):
+        """ Приводите электронную почту к нижнему регистру при регистрации. """
+        return super().clean_email(email).lower()
+
 
     def send_rfp_mail(self, user, password):
         ctx = {
@@ -1,4 +1,4 @@
-from django.db.models import CharField, Count, Q, Value
+from django.db.models import CharField, Q, Value
 from django.db.models.functions import Concat
 
 from rest_framework.filters import SearchFilter
@@ -13,7 +13,6 @@ from django_filters.rest_framework import (
 )
 
 from apps.business.models import Matter
-from apps.business.models.matter import Lead
 
 from ...users import models
 from ..models import AppointmentType, AppUser, Invite, Language
@@ -95,10 +94,10 @@ class MediatorFilter(FilterSet):
     distance__gte = NumberFilter(field_name='distance', lookup_expr='gte')
     distance__lte = NumberFilter(field_name='distance', lookup_expr='lte')
     appointment_type = filters.ModelMultipleChoiceFilter(
-        field_name='appointment_type', queryset=AppointmentType.objects.all()
+        field_name='appointment_type', queryset=AppointmentType.objects.cache()
     )
     spoken_language = filters.ModelMultipleChoiceFilter(
-        field_name='spoken_language', queryset=Language.objects.all()
+        field_name='spoken_language', queryset=Language.objects.cache()
     )
 
     class Meta:
@@ -318,24 +317,15 @@ class LeadClientFilter:
         type = request.query_params.get('type')
         if type == 'client':
             if queryset.model == models.Client:
-                return queryset.annotate(
-                    matter_count=Count('matters')
-                ).annotate(
-                    lead_count=Count(
-                        'leads', filter=Q(leads__status=Lead.STATUS_CONVERTED)
-                    )
-                ).filter(Q(matter_count__gt=0) | Q(lead_count__gt=0))
+                # аннотации добавляются в `Client.mediator_clients_and_leads`
+                return queryset.filter(
+                    Q(has_matters=True) | Q(is_converted=True)
+                )
             elif queryset.model == Invite:
                 return queryset.filter(client_type='client')
         elif type == 'lead':
             if queryset.model == models.Client:
-                return queryset.annotate(
-                    matter_count=Count('matters')
-                ).annotate(
-                    lead_count=Count(
-                        'leads', filter=Q(leads__status=Lead.STATUS_CONVERTED)
-                    )
-                ).filter(matter_count=0, lead_count=0)
+                return queryset.filter(has_matters=False, is_converted=False)
             elif queryset.model == Invite:
                 return queryset.filter(client_type='lead')
         elif type == 'pending':
@@ -0,0 +1,11 @@
+from libs.api.pagination import PageLimitOffsetPagination
+
+
+class SpecialityLimitOffsetPagination(PageLimitOffsetPagination):
+    """Pagination which returns all specialities by default.
+
+    Clients still can request smaller pages with `?limit=&offset=`.
+
+    """
+    default_limit = 1000
+    max_limit = 1000
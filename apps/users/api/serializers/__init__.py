@@ -35,6 +35,7 @@ from .clients import (
 )
 from .enterprise import (
     EnterpriseAndAdminUserSerializer,
+    EnterpriseEntrySerializer,
     EnterpriseMediatorOnboardingSerializer,
     EnterpriseInviteMembersSerializer,
     EnterpriseOtherOnboardingSerializer,
@@ -134,6 +135,7 @@ __all__ = (
     'TimezoneSerializer',
     'EnterpriseSerializer',
     'EnterpriseRegisterSerializer',
+    'EnterpriseEntrySerializer',
     'MemberSerializer',
     'EnterpriseMediatorOnboardingSerializer',
     'EnterpriseOtherOnboardingSerializer',
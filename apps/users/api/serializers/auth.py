@@ -43,7 +43,7 @@ class AppUserLoginSerializer(
         user = None
 
         if email and password:
-            user = User.objects.filter(email__iexact=email).first()
+            user = User.objects.filter(email=email.lower()).first()
         if user and not user.is_active:
             msg = 'This user\'s application is still pending'
             raise NotAuthenticated(msg)
@@ -95,7 +95,7 @@ class AppUserLoginValidationSerializer(
         user = None
 
         if email and password:
-            user = User.objects.filter(email__iexact=email).first()
+            user = User.objects.filter(email=email.lower()).first()
 
         if not user:
             raise NotAuthenticated(_('Wrong credentials'))
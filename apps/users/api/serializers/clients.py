@@ -20,7 +20,7 @@ class ClientShortSerializer(AppUserRelatedSerializerMixin, BaseSerializer):
     city_data = CityShortSerializer(source='city', read_only=True)
     timezone = serializers.PrimaryKeyRelatedField(
         source='user.timezone',
-        queryset=models.TimeZone.objects.all(),
+        queryset=models.TimeZone.objects.cache(),
         required=False
     )
     timezone_data = TimezoneSerializer(source='user.timezone', read_only=True)
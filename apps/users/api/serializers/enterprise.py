@@ -1,13 +1,77 @@
+from django.db import transaction
+from django.db.models.functions import Lower
 from rest_framework import serializers
 from ....core.api.serializers import BaseSerializer
 from ....users import models
 from ...models import AppUser
 from ...models.enterprise_link import EnterpriseMembers
+from ...tasks import send_enterprise_invitations_task
 from .auth import AppUserRelatedRegisterSerializerMixin
 from .enterprise_link import MemberSerializer
 from .extra import FirmLocationSerializer, FirmSizeSerializer
 
 
+def serialize_invited_members(enterprise):
+    """ Сериализуйте приглашенных участников enterprise с их состоянием.
+
+    Состояния приглашений загружаются одним запросом.
+    """
+    invites = {
+        invite.invitee_id: invite
+        for invite in EnterpriseMembers.objects.filter(
+            enterprise=enterprise, invitee__isnull=False
+        ).only('invitee_id', 'state', 'type')
+    }
+    members = []
+    for m in enterprise.team_members_invited.all():
+        data = MemberSerializer(m).data
+        invite = invites[m.pk]
+        data.update({
+            'state': invite.state,
+            'type': invite.type
+        })
+        members.append(data)
+    return members
+
+
+def validate_new_members_emails(team_members):
+    """ Проверьте, что приглашаемые по email участники не зарегистрированы.
+    Почта сравнивается без учета регистра, чтобы найти и пользователей со
+    старыми адресами в смешанном регистре.
+    """
+    registered = set(AppUser.objects.annotate(
+        email_lower=Lower('email')
+    ).filter(
+        email_lower__in=[m['email'].lower() for m in team_members]
+    ).values_list('email_lower', flat=True))
+    for m in team_members:
+        if m['email'].lower() in registered:
+            raise serializers.ValidationError(
+                "User with email '{}' already exist".format(m['email'])
+            )
+
+
+def validate_registered_members(team_members_registered):
+    """ Проверьте, что зарегистрированных пользователей можно пригласить. """
+    users = AppUser.objects.select_related(
+        'owned_enterprise', 'mediator'
+    ).in_bulk(team_members_registered)
+    for user_id in team_members_registered:
+        user = users.get(user_id)
+        if user is None:
+            raise serializers.ValidationError(
+                "User with id={} does not exist".format(user_id)
+            )
+        if user.is_enterprise_admin:
+            raise serializers.ValidationError(
+                "Enterprise admin user(id={}) can't be invited".format(
+                    user_id))
+        if not user.is_mediator:
+            raise serializers.ValidationError(
+                "Client user(id={}) can't be member of team".format(
+                    user_id))
+
+
 class EnterpriseSerializer(BaseSerializer):
     """Serializer for Enterprise model."""
     firm_locations = FirmLocationSerializer(
@@ -56,29 +120,22 @@ class EnterpriseSerializer(BaseSerializer):
         return data
 
     def get_team_members(self, obj):
-        members = []
-        for m in obj.team_members_invited.all():
-            data = MemberSerializer(m).data
-            invite = EnterpriseMembers.objects.get(enterprise=obj, invitee=m)
-            data.update({
-                'state': invite.state,
-                'type': invite.type
-            })
-            members.append(data)
-        return members
+        return serialize_invited_members(obj)
 
     def get_team_members_registered_data(self, obj):
         members = []
         from apps.users.api.serializers import (
             MediatorShortSerializer,
         )
+        states = dict(EnterpriseMembers.objects.filter(
+            enterprise=obj, user__isnull=False
+        ).values_list('user_id', 'state'))
         for m in obj.team_members_registered.all():
             if m.is_mediator:
                 data = MediatorShortSerializer(m.mediator).data
             else:
                 continue
-            data.update({'state': EnterpriseMembers.objects.get(
-                enterprise=obj, user=m).state})
+            data.update({'state': states[m.pk]})
             members.append(data)
         return members
 
@@ -137,6 +194,27 @@ class EnterpriseRegisterSerializer(
         models.Enterprise.objects.create(**enterprise_data)
 
 
+class EnterpriseEntrySerializer(BaseSerializer):
+    """ Сериализатор корпоративной записи для регистрации пользователя.
+
+    Проверяет только поля самой записи, данные пользователя проверяются
+    сериализатором регистрации его роли.
+    """
+
+    class Meta:
+        model = models.Enterprise
+        fields = (
+            'role',
+            'firm_size',
+        )
+
+    def create_entry(self, user):
+        """ Создайте корпоративную запись для зарегистрированного пользователя. """
+        return models.Enterprise.objects.create(
+            user=user, **self.validated_data
+        )
+
+
 class EnterpriseOnboardingSerializer(EnterpriseSerializer):
     """ Встроенный сериализатор для предприятия """
     team_members = serializers.ListField(
@@ -160,27 +238,10 @@ class EnterpriseOnboardingSerializer(EnterpriseSerializer):
         data = super().validate(data)
 
         if team_members is not None:
-            for m in team_members:
-                if AppUser.objects.filter(email=m['email']).exists():
-                    raise serializers.ValidationError(
-                        "User with email '{}' already exist".format(m['email'])
-                    )
+            validate_new_members_emails(team_members)
             data.update({'team_members': team_members})
         if team_members_registered is not None:
-            for user_id in team_members_registered:
-                if not AppUser.objects.filter(pk=user_id).exists():
-                    raise serializers.ValidationError(
-                        "User with id={} does not exist".format(user_id)
-                    )
-                user = AppUser.objects.get(pk=user_id)
-                if user.is_enterprise_admin:
-                    raise serializers.ValidationError(
-                        "Enterprise admin user(id={}) can't be invited".format(
-                            user_id))
-                if not user.is_mediator:
-                    raise serializers.ValidationError(
-                        "Client user(id={}) can't be member of team".format(
-                            user_id))
+            validate_registered_members(team_members_registered)
             data.update({'team_members_registered': team_members_registered})
         return data
 
@@ -222,22 +283,19 @@ class EnterpriseOnboardingSerializer(EnterpriseSerializer):
                 'team_members_registered', []
             )
 
-            members_existing = EnterpriseMembers.objects.filter(
+            members_existing = set(EnterpriseMembers.objects.filter(
                 enterprise=enterprise,
                 user__isnull=False
-            ).values_list('user__id', flat=True)
+            ).values_list('user_id', flat=True))
             members_to_add = [
                 m for m in team_members if m not in members_existing
             ]
-
-            for m in members_to_add:
-                user = models.AppUser.objects.get(pk=m)
-                enterprise.team_members_registered.add(
-                    user,
-                    through_defaults={
-                        'type': EnterpriseMembers.USER_TYPE_MEDIATOR
-                    }
-                )
+            enterprise.team_members_registered.add(
+                *members_to_add,
+                through_defaults={
+                    'type': EnterpriseMembers.USER_TYPE_MEDIATOR
+                }
+            )
         super().update(enterprise, validated_data)
         return models.Enterprise.objects.get(pk=enterprise_id)
 
@@ -363,16 +421,7 @@ class UpdateEnterpriseSerializer(EnterpriseAndAdminUserSerializer):
         return data
 
     def get_team_members_data(self, obj):
-        members = []
-        for m in obj.team_members_invited.all():
-            data = MemberSerializer(m).data
-            invite = EnterpriseMembers.objects.get(enterprise=obj, invitee=m)
-            data.update({
-                'state': invite.state,
-                'type': invite.type
-            })
-            members.append(data)
-        return members
+        return serialize_invited_members(obj)
 
     def validate(self, data):
         """ Проверьте регистрационные данные """
@@ -382,26 +431,9 @@ class UpdateEnterpriseSerializer(EnterpriseAndAdminUserSerializer):
             raise serializers.ValidationError(
                 "Exceed maximum number of team members"
             )
-        for m in data.get('team_members', []):
-            if AppUser.objects.filter(email=m['email']).exists():
-                raise serializers.ValidationError(
-                    "User with email '{}' already exist".format(m['email'])
-                )
+        validate_new_members_emails(data.get('team_members', []))
         if team_members_registered is not None:
-            for user_id in team_members_registered:
-                if not AppUser.objects.filter(pk=user_id).exists():
-                    raise serializers.ValidationError(
-                        "User with id={} does not exist".format(user_id)
-                    )
-                user = AppUser.objects.get(pk=user_id)
-                if user.is_enterprise_admin:
-                    raise serializers.ValidationError(
-                        "Enterprise admin user(id={}) can't be invited".format(
-                            user_id))
-                if not user.is_mediator:
-                    raise serializers.ValidationError(
-                        "Client user(id={}) can't be member of team".format(
-                            user_id))
+            validate_registered_members(team_members_registered)
             data.update({'team_members_registered': team_members_registered})
         return data
 
@@ -463,22 +495,19 @@ class UpdateEnterpriseSerializer(EnterpriseAndAdminUserSerializer):
             ).exclude(user__in=team_members)
             members_to_delete.delete()
 
-            members_existing = EnterpriseMembers.objects.filter(
+            members_existing = set(EnterpriseMembers.objects.filter(
                 enterprise=enterprise,
                 user__isnull=False
-            ).values_list('user__id', flat=True)
+            ).values_list('user_id', flat=True))
             members_to_add = [
                 m for m in team_members if m not in members_existing
             ]
-
-            for m in members_to_add:
-                user = models.AppUser.objects.get(pk=m)
-                enterprise.team_members_registered.add(
-                    user,
-                    through_defaults={
-                        'type': EnterpriseMembers.USER_TYPE_MEDIATOR
-                    }
-                )
+            enterprise.team_members_registered.add(
+                *members_to_add,
+                through_defaults={
+                    'type': EnterpriseMembers.USER_TYPE_MEDIATOR
+                }
+            )
         super().update(enterprise, validated_data)
         return models.Enterprise.objects.get(pk=enterprise.pk)
 
@@ -546,16 +575,7 @@ class EnterpriseInviteMembersSerializer(EnterpriseSerializer):
         )
 
     def get_team_members_data(self, obj):
-        members = []
-        for m in obj.team_members_invited.all():
-            data = MemberSerializer(m).data
-            invite = EnterpriseMembers.objects.get(enterprise=obj, invitee=m)
-            data.update({
-                'state': invite.state,
-                'type': invite.type
-            })
-            members.append(data)
-        return members
+        return serialize_invited_members(obj)
 
     def get_team_members_stats(self, obj):
         mediator_count = len([
@@ -579,67 +599,69 @@ class EnterpriseInviteMembersSerializer(EnterpriseSerializer):
         data = super().validate(data)
 
         if team_members is not None:
-            for m in team_members:
-                if AppUser.objects.filter(email=m['email']).exists():
-                    raise serializers.ValidationError(
-                        "User with email '{}' already exist".format(m['email'])
-                    )
+            validate_new_members_emails(team_members)
             data.update({'team_members': team_members})
         if team_members_registered is not None:
-            for user_id in team_members_registered:
-                if not AppUser.objects.filter(pk=user_id).exists():
-                    raise serializers.ValidationError(
-                        "User with id={} does not exist".format(user_id)
-                    )
-                user = AppUser.objects.get(pk=user_id)
-                if user.is_enterprise_admin:
-                    raise serializers.ValidationError(
-                        "Enterprise admin user(id={}) can't be invited".format(
-                            user_id))
-                if not user.is_mediator:
-                    raise serializers.ValidationError(
-                        "Client user(id={}) can't be member of team".format(
-                            user_id))
+            validate_registered_members(team_members_registered)
             data.update({'team_members_registered': team_members_registered})
         return data
 
     def update(self, enterprise, validated_data):
-        if 'team_members' in validated_data:
-            team_members = validated_data.pop(
-                'team_members', []
-            )
-            for obj in team_members:
-                member, created = models.Member.objects.get_or_create(
-                    email=obj['email']
+        """ Добавьте участников в команду пачками в одной транзакции.
+
+        Приглашения новым участникам отправляются в фоне после коммита.
+        """
+        with transaction.atomic():
+            if 'team_members' in validated_data:
+                team_members = validated_data.pop(
+                    'team_members', []
                 )
-                if not models.EnterpriseMembers.objects.filter(
+                types = {obj['email']: obj['type'] for obj in team_members}
+                models.Member.objects.bulk_create(
+                    [models.Member(email=email) for email in types],
+                    ignore_conflicts=True,
+                    batch_size=500
+                )
+                invited = set(EnterpriseMembers.objects.filter(
                     enterprise=enterprise,
-                    invitee=member
-                ).exists():
-                    member._send_invitation(enterprise, obj['type'])
-                    enterprise.team_members_invited.add(
-                        member,
-                        through_defaults={'type': obj['type']}
+                    invitee__email__in=types
+                ).values_list('invitee_id', flat=True))
+                new_members = [
+                    member for member in models.Member.objects.filter(
+                        email__in=types
+                    ) if member.pk not in invited
+                ]
+                EnterpriseMembers.objects.bulk_create([
+                    EnterpriseMembers(
+                        enterprise=enterprise,
+                        invitee=member,
+                        type=types[member.email]
+                    ) for member in new_members
+                ], batch_size=500)
+                invitations = [
+                    (member.pk, types[member.email]) for member in new_members
+                ]
+                if invitations:
+                    transaction.on_commit(
+                        lambda: send_enterprise_invitations_task.delay(
+                            enterprise.pk, invitations
+                        )
                     )
-        if 'team_members_registered' in validated_data:
-            team_members = validated_data.pop(
-                'team_members_registered', []
-            )
-
-            members_existing = EnterpriseMembers.objects.filter(
-                enterprise=enterprise,
-                user__isnull=False
-            ).values_list('user__id', flat=True)
-            members_to_add = [
-                m for m in team_members if m not in members_existing
-            ]
-
-            for m in members_to_add:
-                user = models.AppUser.objects.get(pk=m)
-                enterprise.team_members_registered.add(
-                    user,
-                    through_defaults={
-                        'type': EnterpriseMembers.USER_TYPE_MEDIATOR
-                    }
+            if 'team_members_registered' in validated_data:
+                team_members = validated_data.pop(
+                    'team_members_registered', []
                 )
+
+                members_existing = set(EnterpriseMembers.objects.filter(
+                    enterprise=enterprise,
+                    user__isnull=False
+                ).values_list('user_id', flat=True))
+                EnterpriseMembers.objects.bulk_create([
+                    EnterpriseMembers(
+                        enterprise=enterprise,
+                        user_id=m,
+                        type=EnterpriseMembers.USER_TYPE_MEDIATOR
+                    ) for m in dict.fromkeys(team_members)
+                    if m not in members_existing
+                ], batch_size=500)
         return models.Enterprise.objects.get(pk=enterprise.pk)
@@ -64,7 +64,7 @@ class MediatorSerializer(AppUserRelatedSerializerMixin, BaseSerializer):
     )
     timezone = serializers.PrimaryKeyRelatedField(
         source='user.timezone',
-        queryset=models.TimeZone.objects.all(),
+        queryset=models.TimeZone.objects.cache(),
         required=False
     )
     timezone_data = TimezoneSerializer(source='user.timezone', read_only=True)
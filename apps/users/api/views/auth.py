@@ -1,7 +1,8 @@
 import os
 from django.conf import settings
 from django.contrib.auth.signals import user_logged_in
-from django.db.transaction import non_atomic_requests
+from django.core import management
+from django.db.transaction import non_atomic_requests, on_commit
 from django.http.response import Http404
 from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
@@ -14,13 +15,17 @@ from allauth.account.models import EmailAddress
 from constance import config
 from rest_auth import views
 from rest_auth.registration import views as reg_views
+from twilio.base.exceptions import TwilioRestException
 from twilio.rest import Client
 from apps.core.api.views import UserAgentLoggingMixin
 from apps.users.models.users import AppUser
-from ... import utils
+from ... import tasks, utils
 from ...api import serializers
 from .utils.verification import resend_email_confirmation
 
+# seconds client should wait before retrying rate limited twilio request
+TWILIO_RETRY_AFTER = 60
+
 
 @method_decorator(non_atomic_requests, name='dispatch')
 class AppUserLoginView(UserAgentLoggingMixin, views.LoginView):
@@ -176,10 +181,10 @@ class VerifyConfirmEmailRedirectView(UserAgentLoggingMixin,
     url = config.PROD_FRONTEND_LINK
 
     def get_redirect_url(self):
-        from ... import notifications
-        from ....users.models import AppUser 
-        user = AppUser.objects.filter(email=self.get_object().email_address).first()
-        notifications.RegisterUserNotification(user).send()
+        user_id = self.object.email_address.user_id
+        on_commit(
+            lambda: tasks.send_register_user_notification_task.delay(user_id)
+        )
         return 'https://app.justmediationhub.com/auth/email-verified?success=true'
 
     def get(self, *args, **kwargs):
@@ -201,7 +206,7 @@ class ResendEmailConfirmation(UserAgentLoggingMixin, views.APIView):
     def post(self, request):
         try:
             email = request.data['email']
-            user = AppUser.objects.get(email__iexact=email)
+            user = AppUser.objects.get(email=email.lower())
             resend_email_confirmation(request, user, True)
             return Response(
                 status=status.HTTP_200_OK,
@@ -209,7 +214,7 @@ class ResendEmailConfirmation(UserAgentLoggingMixin, views.APIView):
                     "detail": "Resend verification successfully"
                 }
             )
-        except Exception:
+        except (KeyError, AppUser.DoesNotExist, EmailAddress.DoesNotExist):
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={
@@ -239,19 +244,42 @@ class VerifyCodeView(UserAgentLoggingMixin, views.APIView):
                     "success": verification_check.valid
                 }
             )
-        except Exception:
+        except TwilioRestException as e:
+            if e.status == status.HTTP_429_TOO_MANY_REQUESTS:
+                return Response(
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={'Retry-After': str(TWILIO_RETRY_AFTER)},
+                    data={
+                        "success": False
+                    }
+                )
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "success": False
+                }
+            )
+        except (KeyError, TypeError):
+            # `TypeError` - телефон не строка, кэш форматирования не может
+            # использовать его как ключ
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={
                     "success": False
                 }
             )
+        except Exception:
+            return Response(
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                data={
+                    "success": False
+                }
+            )
 
 
 class SyncPlanView(UserAgentLoggingMixin, views.APIView):
 
     def get(self, request):
-        from django.core import management
         management.call_command('djstripe_sync_plans_from_stripe', verbosity=0)
         return Response(
             status=status.HTTP_200_OK,
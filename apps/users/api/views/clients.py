@@ -1,10 +1,18 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import Q
 from rest_framework import generics, mixins, response, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from allauth.account.app_settings import EmailVerificationMethod
+from libs.api.utils import optimize_queryset
+from apps.business.api.serializers.matter import MatterOverviewSerializer
+from apps.business.api.serializers.posted_matters import (
+    PostedMatterSerializer,
+)
+from apps.business.models.matter import Lead
 from apps.business.models.posted_matters import PostedMatter
 from ....business.api.serializers.external_overview import (
     ClientOverviewSerializer,
@@ -17,6 +25,8 @@ from ..filters import MediatorSearchFilter
 from ..serializers.extra import MediatorSearchSerializer
 from .utils.verification import complete_signup
 
+User = get_user_model()
+
 
 class ClientViewSet(
     mixins.CreateModelMixin,
@@ -27,20 +37,9 @@ class ClientViewSet(
 ):
     """ Конечная точка пользователя приложения для поиска пользователей и регистрации. """
     serializer_class = serializers.ClientSerializer
-    queryset = models.Client.objects.select_related(
-        'user',
-        'country',
-        'state',
-        'city',
-        'city__region',
-        'user__timezone',
-    ).prefetch_related(
-        'user__specialities',
-        'user__activities',
-        'user__activities__matter',
-        'matters__mediator',
-        'matters',
-    )
+    queryset = models.Client.objects.select_related('user')
+    # действия, которые выводят профиль клиента
+    profile_actions = ('list', 'retrieve')
     permissions_map = {
         'create': (AllowAny,),
     }
@@ -67,14 +66,16 @@ class ClientViewSet(
     lookup_value_regex = '[0-9]+'
 
     def get_queryset(self):
-        """ Добавьте mediator_id qs, используя параметры запроса """
+        """ Добавьте mediator_id qs, используя параметры запроса.
+        Связи профиля загружаются только для действий, которые его выводят.
+        """
         qs = super().get_queryset()
+        if self.action in self.profile_actions:
+            qs = qs.for_api()
         qp = self.request.query_params
-        print(qp)
         mediator_id = qp.get('mediator', None)
         search = qp.get('search', None)
         if search or search == '':
-            print("search!!")
             return qs.filter(address1="1000")
         if mediator_id:
             return qs.filter(
@@ -95,16 +96,25 @@ class ClientViewSet(
         serializer.is_valid(raise_exception=True)
         user = serializer.save(self.request)
         headers = self.get_success_headers(serializer.validated_data)
-        serializer = serializers.ClientSerializer(
-            instance=user.client
-        )
+        client = models.Client.objects.select_related(
+            'user',
+            'user__timezone',
+            'country',
+            'state',
+            'city',
+        ).prefetch_related(
+            'user__specialities',
+        ).get(pk=user.pk)
+        serializer = serializers.ClientSerializer(instance=client)
 
-        complete_signup(
-            self.request._request,
-            user,
-            settings.ACCOUNT_EMAIL_VERIFICATION,
-            None
-        )
+        if settings.ACCOUNT_EMAIL_VERIFICATION != EmailVerificationMethod.NONE:
+            complete_signup(
+                self.request._request,
+                user,
+                settings.ACCOUNT_EMAIL_VERIFICATION,
+                None,
+                send_async=True
+            )
 
         return Response(
             serializer.data,
@@ -122,9 +132,6 @@ class ClientViewSet(
         возвращает список matter (обзоры)
         """
         client = self.get_object()
-        from apps.business.api.serializers.matter import (
-            MatterOverviewSerializer,
-        )
         try:
             matter = client.matters.get(id=self.kwargs['matter_id'])
             serializer = MatterOverviewSerializer(
@@ -164,31 +171,37 @@ class ClientViewSet(
         is_active = request.query_params.get('is_active', '')
         is_hidden_for_client = request.query_params.get('is_hidden_for_client')
         client = self.get_object()
-        from apps.business.api.serializers.posted_matters import (
-            PostedMatterSerializer,
-        )
-        posted_matters = client.posted_matters
+        query = Q()
         if is_active == 'true':
-            posted_matters = posted_matters.filter(
-                status=PostedMatter.STATUS_ACTIVE
-            )
+            query &= Q(status=PostedMatter.STATUS_ACTIVE)
         elif is_active == 'false':
-            posted_matters = posted_matters.filter(
-                status=PostedMatter.STATUS_INACTIVE
-            )
+            query &= Q(status=PostedMatter.STATUS_INACTIVE)
         if is_hidden_for_client == 'true':
-            posted_matters = posted_matters.filter(is_hidden_for_client=True)
+            query &= Q(is_hidden_for_client=True)
         elif is_hidden_for_client == 'false':
-            posted_matters = posted_matters.filter(is_hidden_for_client=False)
+            query &= Q(is_hidden_for_client=False)
+        posted_matters = client.posted_matters.filter(query).select_related(
+            'practice_area',
+            'client',
+            'client__user',
+            'currency',
+        ).prefetch_related(
+            'proposals',
+            'proposals__mediator',
+            'proposals__mediator__user',
+            'proposals__currency',
+        )
 
-        page = self.paginate_queryset(queryset=posted_matters.all())
+        page = self.paginate_queryset(queryset=posted_matters)
 
         if page is not None:
-            serializer = PostedMatterSerializer(posted_matters, many=True)
+            serializer = PostedMatterSerializer(
+                page, many=True, context={'request': request}
+            )
             return self.paginator.get_paginated_response(data=serializer.data)
 
         serializer = PostedMatterSerializer(
-            posted_matters, many=True
+            posted_matters, many=True, context={'request': request}
         )
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -239,15 +252,20 @@ class ClientViewSet(
     def get_contacts(self, request, *args, **kwargs):
         """ возвращает список контактов клиента  """
         client = self.get_object()
-        contacts = client.contacts()
-        contact_users = get_user_model().objects.filter(id__in=contacts)
-        page = self.paginate_queryset(queryset=list(contact_users))
-        serializer = serializers.AppUserShortSerializer(
-            contact_users, many=True
-        )
+        # профили присоединяются для определения `user_type` без
+        # дополнительных запросов на каждого пользователя
+        contact_users = User.objects.filter(
+            id__in=client.contacts()
+        ).select_related(
+            'client', 'mediator', 'support', 'owned_enterprise'
+        ).order_by('pk')
+        page = self.paginate_queryset(queryset=contact_users)
         if page is not None:
             serializer = serializers.AppUserShortSerializer(page, many=True)
             return self.paginator.get_paginated_response(data=serializer.data)
+        serializer = serializers.AppUserShortSerializer(
+            contact_users, many=True
+        )
         return Response(
             status=status.HTTP_200_OK,
             data=serializer.data
@@ -256,12 +274,12 @@ class ClientViewSet(
     @action(detail=True, methods=['POST'])
     def add_contact(self, request, *args, **kwargs):
         """ Добавить адвоката в качестве контакта  """
-        from apps.business.models.matter import Lead
-
         client = self.get_object()
         mediator_id = request.data.get("client", None)
         try:
-            mediator = models.Mediator.objects.get(pk=mediator_id)
+            mediator = models.Mediator.objects.only('pk').get(
+                pk=mediator_id
+            )
             Lead.objects.get_or_create(mediator=mediator, client=client)
             return Response(
                 status=status.HTTP_200_OK,
@@ -285,7 +303,18 @@ class ClientViewSet(
             )
 
 
+class CurrentClientMixin:
+    """ Миксин для доступа к профилю клиента текущего пользователя. """
+
+    def get_client(self):
+        """ Получите профиль клиента пользователя один раз за запрос. """
+        if not hasattr(self.request, '_client_cache'):
+            self.request._client_cache = self.request.user.client
+        return self.request._client_cache
+
+
 class CurrentClientView(
+    CurrentClientMixin,
     UserAgentLoggingMixin,
     generics.UpdateAPIView,
     generics.RetrieveAPIView,
@@ -306,10 +335,11 @@ class CurrentClientView(
 
     def get_object(self):
         """ Получите профиль клиента пользователя. """
-        return self.request.user.client
+        return self.get_client()
 
 
 class CurrentClientFavoriteViewSet(
+    CurrentClientMixin,
     mixins.UpdateModelMixin,
     BaseViewSet
 ):
@@ -318,38 +348,52 @@ class CurrentClientFavoriteViewSet(
     serializer_class = serializers.ClientFavoriteMediatorSerializer
     permission_classes = IsAuthenticated, permissions.IsClient
 
+    def get_favorites_data(self, client):
+        """ Сериализуйте избранных адвокатов клиента.
+        Адвокаты и их выводимые связи загружаются вместе с клиентом,
+        а не отдельными запросами для каждого адвоката.
+        """
+        client = models.Client.objects.with_favorite_mediators(
+            optimize_queryset(
+                models.Mediator.objects.all(), serializers.MediatorSerializer
+            )
+        ).get(pk=client.pk)
+        return self.serializer_class(client).data
+
     def list(self, request, *args, **kwargs):
-        client = request.user.client
+        client = self.get_client()
         return Response(
             status=status.HTTP_200_OK,
-            data=self.serializer_class(client).data
+            data=self.get_favorites_data(client)
         )
 
     def update(self, request, pk=None):
-        client = request.user.client
-        if models.Mediator.objects.filter(pk=pk).exists():
-            client.favorite_mediators.add(pk)
-            mediator = models.Mediator.objects.get(pk=pk)
-            mediator.followers.add(client.user)
-            return Response(
-                status=status.HTTP_200_OK,
-                data=self.serializer_class(client).data
-            )
-        else:
+        client = self.get_client()
+        try:
+            mediator = models.Mediator.objects.only('pk').get(pk=pk)
+        except models.Mediator.DoesNotExist:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={"detail": "Mediator does not exist"}
             )
+        with transaction.atomic():
+            client.favorite_mediators.add(mediator)
+            mediator.followers.add(client.user)
+        return Response(
+            status=status.HTTP_200_OK,
+            data=self.get_favorites_data(client)
+        )
 
     def destroy(self, request, pk=None):
-        client = request.user.client
-        if models.Mediator.objects.filter(pk=pk).exists():
-            client.favorite_mediators.remove(pk)
-            mediator = models.Mediator.objects.get(pk=pk)
-            mediator.followers.remove(client.user)
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        else:
+        client = self.get_client()
+        try:
+            mediator = models.Mediator.objects.only('pk').get(pk=pk)
+        except models.Mediator.DoesNotExist:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={"detail": "Mediator does not exist"}
             )
+        with transaction.atomic():
+            client.favorite_mediators.remove(mediator)
+            mediator.followers.remove(client.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
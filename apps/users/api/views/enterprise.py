@@ -1,10 +1,16 @@
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Prefetch, Q
 
 from rest_framework import generics, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from libs.api.utils import optimize_queryset
 
 from apps.business.api.serializers.external_overview import (
     EnterpriseDetailedOverviewSerializer,
@@ -13,11 +19,27 @@ from apps.core.api.views import BaseViewSet, UserAgentLoggingMixin
 from apps.finance.services import stripe_subscriptions_service
 
 from ...api import permissions, serializers
-from ...models import Mediator, Enterprise, EnterpriseMembers
+from ...models import (
+    AppUser,
+    Enterprise,
+    EnterpriseMembers,
+    Mediator,
+)
 from ..filters import EnterpriseFilter
 from .utils.verification import complete_signup
 
 
+REGISTRATION_STAGE_SERIALIZERS = {
+    'first': serializers.EnterpriseRegisterValidFirstStepSerializer,
+    'second': serializers.EnterpriseRegisterValidSecondStepSerializer,
+}
+
+# registration serializers of enterprise admin user by enterprise role
+ROLE_REGISTER_SERIALIZERS = {
+    Enterprise.ROLE_MEDIATOR: serializers.MediatorRegisterSerializer,
+}
+
+
 class EnterpriseViewSet(
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -46,24 +68,22 @@ class EnterpriseViewSet(
     serializer_class = serializers.EnterpriseAndAdminUserSerializer
     queryset = Enterprise.objects.real_users().verified().select_related(
         'user',
-    ).prefetch_related(
-        'followers',
+    )
+    # relations used by serializer method fields or which need narrowed
+    # querysets, the rest ones are detected from serializer
+    extra_related_lookups = (
         'user__specialities',
-        'firm_size',
-        'firm_locations',
-        'firm_locations__country',
-        'firm_locations__state',
-        'firm_locations__city',
-        'firm_locations__city__region',
+        # serializer renders only followers ids
+        Prefetch('followers', queryset=AppUser.objects.only('pk')),
         'team_members_invited',
-        'team_members_registered',
+        Prefetch(
+            'team_members_registered',
+            queryset=AppUser.objects.select_related('mediator')
+        ),
     )
+    # actions which use only enterprise itself and its admin user
+    light_actions = ('onboarding', 'invite_members', 'delete_members')
     filterset_class = EnterpriseFilter
-    search_fields = [
-        '@user__first_name',
-        '@user__last_name',
-        'user__email',
-    ]
     ordering_fields = [
         'featured',
         'distance',
@@ -81,8 +101,43 @@ class EnterpriseViewSet(
     #    retrieve method
     lookup_value_regex = '[0-9]+'
 
+    def get_queryset(self):
+        """Prefetch only relations used by the current action.
+
+        Detail actions aren't limited to verified enterprises, so that
+        admin can onboard the enterprise before verification. List is
+        searched by admin's stored and GIN indexed search vector (name and
+        email), see `UserSearchQuerySet.search`.
+
+        """
+        if self.action == 'list':
+            qs = super().get_queryset()
+            search = self.request.query_params.get(
+                api_settings.SEARCH_PARAM
+            )
+            if search:
+                qs = qs.search(search)
+        else:
+            qs = Enterprise.objects.select_related('user')
+        if self.action in self.light_actions:
+            return qs
+        return self.optimize_queryset(qs, self.get_serializer_class())
+
+    def optimize_queryset(self, queryset, serializer_class):
+        """Prefetch relations used by `serializer_class`."""
+        return optimize_queryset(
+            queryset,
+            serializer_class,
+            extra_lookups=self.extra_related_lookups
+        )
+
     def get_object(self):
-        return Enterprise.objects.get(user_id=self.kwargs['pk'])
+        """Get enterprise by its admin user id from action queryset."""
+        enterprise = get_object_or_404(
+            self.get_queryset(), user_id=self.kwargs['pk']
+        )
+        self.check_object_permissions(self.request, enterprise)
+        return enterprise
 
     def create(self, request, *args, **kwargs):
         """Register user and return enterprise profile.
@@ -94,42 +149,48 @@ class EnterpriseViewSet(
         SetupIntent).
 
         """
-        enterprise_serializer = serializers.EnterpriseRegisterSerializer(
+        register_serializer_class = ROLE_REGISTER_SERIALIZERS.get(
+            request.data.get('role')
+        )
+        if register_serializer_class is None:
+            raise ValidationError({'role': ['Unsupported enterprise role.']})
+
+        # user data is validated once by role registration serializer,
+        # enterprise serializer checks only fields of enterprise entry
+        enterprise_serializer = serializers.EnterpriseEntrySerializer(
             data=request.data
         )
         enterprise_serializer.is_valid(raise_exception=True)
-
-        if request.data.get('role') == Enterprise.ROLE_MEDIATOR:
-            serializer = serializers.MediatorRegisterSerializer(
-                data=request.data)
-            serializer.is_valid(raise_exception=True)
-            data = serializer.validated_data
-            #  If the view produces an exception, rolls back the transaction
-            #  of creation user and mediator.
-            headers = self.get_success_headers(data)
-            payment_method = data.get('payment_method', None)
-            with transaction.atomic():
-                user = serializer.save(self.request)
-                enterprise_serializer.create_entry(user)
-
-                mediator = Mediator.objects.get(pk=user.pk)
-                mediator.enterprise = user.owned_enterprise
-                mediator.save()
-                if payment_method is not None:
-                    stripe_subscriptions_service. \
-                        create_customer_with_attached_card(
-                            user=user,
-                            payment_method=payment_method
-                        )
-            serializer = serializers.MediatorSerializer(
-                instance=mediator
-            )
+        serializer = register_serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        #  If the view produces an exception, rolls back the transaction
+        #  of creation user and mediator.
+        headers = self.get_success_headers(data)
+        payment_method = data.get('payment_method', None)
+        with transaction.atomic():
+            user = serializer.save(self.request)
+            enterprise = enterprise_serializer.create_entry(user)
+
+            mediator = Mediator.objects.get(pk=user.pk)
+            mediator.enterprise = enterprise
+            mediator.save()
+            if payment_method is not None:
+                stripe_subscriptions_service. \
+                    create_customer_with_attached_card(
+                        user=user,
+                        payment_method=payment_method
+                    )
+        serializer = serializers.MediatorSerializer(
+            instance=mediator
+        )
 
         complete_signup(
             self.request._request,
             user,
             settings.ACCOUNT_EMAIL_VERIFICATION,
-            None
+            None,
+            send_async=True
         )
 
         return Response(
@@ -142,29 +203,28 @@ class EnterpriseViewSet(
     def onboarding(self, request, **kwargs):
         """Onboarding enterprise"""
         enterprise = self.get_object()
-        if not enterprise:
-            return Response(status=status.HTTP_400_BAD_REQUEST, data={
-                "success": False,
-                "detail": "Not found enterprise user"
-            })
-        if request.user != enterprise.user:
+        if request.user.pk != enterprise.user_id:
             return Response(status=status.HTTP_400_BAD_REQUEST, data={
                 "success": False,
                 "detail": "You don't have permission to onboard that user"
             })
-        if request.user.is_mediator:
-            serializer = serializers.EnterpriseMediatorOnboardingSerializer(
-                data=request.data,
-                context={"request": request}
-            )
-        else:
-            serializer = serializers.EnterpriseOtherOnboardingSerializer(
-                data=request.data,
-                context={"request": request}
-            )
+        onboarding_serializer_class = (
+            serializers.EnterpriseMediatorOnboardingSerializer
+            if request.user.is_mediator
+            else serializers.EnterpriseOtherOnboardingSerializer
+        )
+        serializer = onboarding_serializer_class(
+            data=request.data,
+            context={"request": request}
+        )
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
-        enterprise = serializer.update(enterprise.id, data)
+        serializer.update(enterprise.id, data)
+        # re-fetch updated enterprise with relations rendered in response
+        enterprise = self.optimize_queryset(
+            Enterprise.objects.select_related('user'),
+            serializers.EnterpriseAndAdminUserSerializer
+        ).get(pk=enterprise.id)
         serializer = serializers.EnterpriseAndAdminUserSerializer(
             instance=enterprise
         )
@@ -190,16 +250,14 @@ class EnterpriseViewSet(
                 payment info.
 
         """
-        stage_serializer = serializers.EnterpriseRegisterValidateSerializer(
-            data=request.query_params
-        )
-        stage_serializer.is_valid(raise_exception=True)
-        stage = stage_serializer.validated_data['stage']
-        reg_stage_serializer_map = {
-            'first': serializers.EnterpriseRegisterValidFirstStepSerializer,
-            'second': serializers.EnterpriseRegisterValidSecondStepSerializer
-        }
-        serializer = reg_stage_serializer_map[stage](data=request.data)
+        stage = request.query_params.get('stage')
+        if not stage:
+            raise ValidationError({'stage': ['This field is required.']})
+        if stage not in REGISTRATION_STAGE_SERIALIZERS:
+            raise ValidationError(
+                {'stage': [f'"{stage}" is not a valid choice.']}
+            )
+        serializer = REGISTRATION_STAGE_SERIALIZERS[stage](data=request.data)
         serializer.is_valid(raise_exception=True)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -218,69 +276,67 @@ class EnterpriseViewSet(
     @action(detail=True, methods=['POST'])
     def invite_members(self, request, *args, **kwargs):
         """Invite new team members"""
-        try:
-            enterprise = self.get_object()
-            if request.user != enterprise.user:
-                return Response(status=status.HTTP_400_BAD_REQUEST, data={
-                    "success": False,
-                    "detail": "You don't have permission to onboard that user"
-                })
-            serializer = serializers.EnterpriseInviteMembersSerializer(
-                data=request.data
+        enterprise = self.get_object()
+        if request.user.pk != enterprise.user_id:
+            raise PermissionDenied(
+                "You don't have permission to invite members"
             )
-            serializer.is_valid(raise_exception=True)
-            data = serializer.validated_data
-            enterprise = serializer.update(enterprise, data)
+        serializer = serializers.EnterpriseInviteMembersSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        enterprise = serializer.update(enterprise, data)
 
-            serializer = serializers.EnterpriseInviteMembersSerializer(
-                instance=enterprise
-            )
+        serializer = serializers.EnterpriseInviteMembersSerializer(
+            instance=enterprise
+        )
 
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK
-            )
-        except Exception as e:
-            return Response(
-                status=status.HTTP_400_BAD_REQUEST,
-                data={"success": False, "detail": str(e)}
-            )
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK
+        )
 
     @action(detail=True, methods=['DELETE'])
     def delete_members(self, request, *args, **kwargs):
         """Delete team members"""
+        enterprise = self.get_object()
+        if request.user.pk != enterprise.user_id:
+            raise PermissionDenied(
+                "You don't have permission to delete members"
+            )
+
+        members_filter = Q()
+        team_members_registered = []
         try:
-            enterprise = self.get_object()
-            if request.user != enterprise.user:
-                return Response(status=status.HTTP_400_BAD_REQUEST, data={
-                    "success": False,
-                    "detail": "You don't have permission to onboard that user"
-                })
             if 'team_members' in request.data:
                 team_members = request.data.get('team_members', [])
-                EnterpriseMembers.objects.filter(
-                    enterprise=enterprise,
+                members_filter |= Q(
                     invitee__email__in=[m['email'] for m in team_members]
-                ).delete()
+                )
             if 'team_members_registered' in request.data:
-                team_members = request.data.get('team_members_registered', [])
+                team_members_registered = [
+                    int(m) for m in
+                    request.data.get('team_members_registered', [])
+                ]
+                members_filter |= Q(user__in=team_members_registered)
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError('Invalid team members data')
+
+        if members_filter:
+            with transaction.atomic():
                 EnterpriseMembers.objects.filter(
-                    enterprise=enterprise,
-                    user__in=team_members
+                    members_filter, enterprise=enterprise
                 ).delete()
-                Mediator.objects.filter(
-                    user__in=team_members
-                ).update(enterprise=None)
+                if team_members_registered:
+                    Mediator.objects.filter(
+                        user__in=team_members_registered
+                    ).update(enterprise=None)
 
-            return Response(
-                status=status.HTTP_200_OK,
-                data={"success": True}
-            )
-        except Exception as e:
-            return Response(
-                status=status.HTTP_400_BAD_REQUEST,
-                data={"success": False, "detail": str(e)}
-            )
+        return Response(
+            status=status.HTTP_200_OK,
+            data={"success": True}
+        )
 
 
 class CurrentEnterpriseView(
@@ -2,10 +2,16 @@ from rest_framework import mixins, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from libs.api.views.mixins import (
+    AutoPrefetchMixin,
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
+)
 from apps.users.api import filters
 
 from ....core.api.views import BaseViewSet
 from ...api import serializers
+from ..pagination import SpecialityLimitOffsetPagination
 from ...models import (
     AppointmentType,
     Currencies,
@@ -21,6 +27,8 @@ from ..permissions import CanUpdatePA
 
 
 class SpecialityViewSet(
+    OnlySerializerFieldsMixin,
+    AutoPrefetchMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     mixins.UpdateModelMixin,
@@ -36,15 +44,12 @@ class SpecialityViewSet(
         "update": (IsAuthenticated, CanUpdatePA, ),
     }
     queryset = Speciality.objects.order_by('title')
+    pagination_class = SpecialityLimitOffsetPagination
     search_fields = [
         'title',
     ]
     filterset_class = filters.SpecialityFilter
 
-    def list(self, request, *args, **kwargs):
-        self.pagination_class.default_limit = 1000
-        return super().list(request, *args, **kwargs)
-
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         if instance.created_by == request.user:
@@ -72,6 +77,8 @@ class SpecialityViewSet(
 
 
 class FeeKindViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -85,6 +92,8 @@ class FeeKindViewSet(
     ]
 
 class LawFirmViewSet(
+    OnlySerializerFieldsMixin,
+    AutoPrefetchMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -97,20 +106,16 @@ class LawFirmViewSet(
         'name',
     ]
     def get_queryset(self):
+        """ Возвращайте фирмы только при поиске по названию. """
         qs = super().get_queryset()
-        qp = self.request.query_params
-        search = qp.get('search', None)
-        if search == '':
-            print("search!!")
-            return qs.filter(name="1000000000")
-        if search:
-            from django.db.models import Q
-            return qs.filter(
-                Q(name__icontains=search)
-            )
-        return qs.filter(name="1000000000")
+        search = self.request.query_params.get('search', None)
+        if not search:
+            return qs.none()
+        return qs.filter(name__icontains=search)
 
 class AppointmentTypeViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -125,6 +130,8 @@ class AppointmentTypeViewSet(
 
 
 class PaymentTypeViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -139,6 +146,8 @@ class PaymentTypeViewSet(
 
 
 class LanguageViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -153,6 +162,8 @@ class LanguageViewSet(
 
 
 class CurrenciesViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -167,6 +178,8 @@ class CurrenciesViewSet(
 
 
 class FirmSizeViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -181,6 +194,8 @@ class FirmSizeViewSet(
 
 
 class TimezoneViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
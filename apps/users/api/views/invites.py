@@ -27,7 +27,8 @@ class InviteViewSet(
         'resend': invite_permissions,
     }
     serializer_class = serializers.InviteSerializer
-    queryset = models.Invite.objects.without_user().only_invited_type()
+    queryset = models.Invite.objects.without_user().only_invited_type() \
+        .optimized()
     search_fields = (
         '@first_name',
         '@last_name',
@@ -1,11 +1,19 @@
 from rest_framework import mixins
 from rest_framework.permissions import AllowAny
+from libs.api.views.mixins import (
+    AutoPrefetchMixin,
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
+)
 from ....core.api.views import BaseViewSet
 from .. import filters, serializers
 from ...models import MediatorUniversity
 
 
 class MediatorUniversityViewSet(
+    CachedListMixin,
+    OnlySerializerFieldsMixin,
+    AutoPrefetchMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     BaseViewSet
@@ -1,14 +1,19 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import Q
 from django.db.models.query import Prefetch
 from django.http.response import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import generics, mixins, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from libs.api.views.mixins import CachedRetrieveMixin
+
 from apps.business.api.serializers.external_overview import (
     MediatorDetailedOverviewSerializer,
     LeadAndClientSerializer,
@@ -20,10 +25,11 @@ from apps.business.models import PostedMatter, Proposal
 from apps.business.models.matter import Lead, Matter
 from apps.core.api.views import BaseViewSet, UserAgentLoggingMixin
 from apps.finance.services import stripe_subscriptions_service
+from apps.social.api.serializers import ContactShareSerializer
 from apps.social.models import Chats
 from apps.users import services
 from .. import permissions, serializers
-from ...models import Mediator, Client, Enterprise, EnterpriseMembers, Invite
+from ...models import Mediator, Client, EnterpriseMembers, Invite
 from ..filters import (
     MediatorFilter,
     IndustryContactsSearchFilter,
@@ -36,10 +42,38 @@ from ..serializers.industry_contacts import (
     IndustryContactDetails,
     IndustryContactSerializer,
 )
+from .utils.contacts import (
+    INDUSTRY_CONTACT_COLUMNS,
+    LEAD_CLIENT_CLIENT_COLUMNS,
+    LEAD_CLIENT_INVITE_COLUMNS,
+    is_invite_id,
+    order_contacts,
+    project_contacts,
+    sort_contacts_data,
+)
 from .utils.verification import complete_signup
 
+User = get_user_model()
+
+# сериализаторы для проверки этапов регистрации адвоката
+REGISTRATION_STAGE_SERIALIZERS = {
+    'first': serializers.MediatorRegisterValidateFirstStepSerializer,
+    'second': serializers.MediatorRegisterValidateSecondStepSerializer,
+}
+
+# модели и сериализаторы контактов адвоката по признаку `is_pending`
+CONTACT_MODELS = {
+    True: Invite,
+    False: Client,
+}
+CONTACT_UPDATE_SERIALIZERS = {
+    True: serializers.UpdateInviteSerializer,
+    False: serializers.UpdateClientSerializer,
+}
+
 
 class MediatorViewSet(
+    CachedRetrieveMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
@@ -78,21 +112,9 @@ class MediatorViewSet(
         'user__client',
         'user__owned_enterprise',
         'fee_currency',
-    ).prefetch_related(
-        Prefetch(
-            'matters', queryset=Matter.objects.order_by('-modified')
-        ),
-        Prefetch(
-            'user__chats', queryset=Chats.objects.annotate(
-                msg_count=Count('messages')
-            ).filter(msg_count__gt=0).prefetch_related(
-                'messages', 'participants'
-            ).order_by('-modified')
-        ),
-        'matters__client',
-        'matters__mediator',
-        'matters__speciality',
-        'matters__fee_type',
+    )
+    # связи, которые выводятся в профиле адвоката
+    profile_related_lookups = (
         'followers',
         'education',
         'education__university',
@@ -110,14 +132,34 @@ class MediatorViewSet(
         'payment_type',
         'spoken_language',
         'registration_attachments',
+    )
+    # связи, которые нужны только для панели управления адвокатом
+    overview_related_lookups = (
+        Prefetch(
+            'matters', queryset=Matter.objects.order_by('-modified')
+        ),
+        Prefetch(
+            'user__chats', queryset=Chats.objects.filter(
+                messages__isnull=False
+            ).distinct().prefetch_related(
+                'participants'
+            ).order_by('-modified')
+        ),
+        'matters__client',
+        'matters__mediator',
+        'matters__speciality',
+        'matters__fee_type',
         'user__billing_item__billing_items_invoices',
     )
+    profile_actions = ('list', 'retrieve', 'overview')
+    # колонки, которые не выводятся в профиле адвоката; профиль клиента
+    # присоединяется только для определения типа пользователя
+    profile_deferred_fields = (
+        'user__password',
+        'user__client__note',
+        'user__client__help_description',
+    )
     filterset_class = MediatorFilter
-    search_fields = [
-        '@user__first_name',
-        '@user__last_name',
-        'user__email',
-    ]
     ordering_fields = [
         'featured',
         'distance',
@@ -135,8 +177,23 @@ class MediatorViewSet(
     lookup_value_regex = '[0-9]+'
 
     def get_queryset(self):
-        """ Добавьте расстояние к qs, используя данные из query_params. """
+        """ Добавьте расстояние к qs, используя данные из query_params.
+        Связи профиля загружаются только для действий, которые его выводят,
+        а дела, чаты и счета - только для панели управления.
+        Список ищется одним полнотекстовым запросом по имени и email.
+        """
         qs = super().get_queryset()
+        search = self.request.query_params.get(api_settings.SEARCH_PARAM)
+        if self.action == 'list' and search:
+            qs = qs.search(search)
+        if self.action in self.profile_actions:
+            qs = qs.lightweight().defer(
+                *self.profile_deferred_fields
+            ).prefetch_related(
+                *self.profile_related_lookups
+            )
+        if self.action == 'overview':
+            qs = qs.prefetch_related(*self.overview_related_lookups)
         qp = self.request.query_params
         if qp.get('is_verified') == "true":
             return qs.verified()
@@ -242,18 +299,14 @@ class MediatorViewSet(
         )
         stage_serializer.is_valid(raise_exception=True)
         stage = stage_serializer.validated_data['stage']
-        reg_stage_serializer_map = {
-            'first': serializers.MediatorRegisterValidateFirstStepSerializer,
-            'second': serializers.MediatorRegisterValidateSecondStepSerializer
-        }
-        serializer = reg_stage_serializer_map[stage](data=request.data)
+        serializer = REGISTRATION_STAGE_SERIALIZERS[stage](data=request.data)
         serializer.is_valid(raise_exception=True)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=['GET'])
     def overview(self, request, *args, **kwargs):
         """ Возвращает обзорные сведения для панели управления адвокатом. """
-        mediator = get_object_or_404(self.queryset, **kwargs)
+        mediator = self.get_object()
         serializer = MediatorDetailedOverviewSerializer(mediator, context={
             'request': request
         })
@@ -268,22 +321,17 @@ class MediatorViewSet(
         # Проверка разрешений адвоката.
         self.get_object()
 
-        object_map = {
-            True: Invite,
-            False: Client
-        }
-        from apps.social.api.serializers import ContactShareSerializer
         serializer = ContactShareSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         is_pending = serializer.validated_data['is_pending']
 
         try:
-            contact = object_map[is_pending].objects.get(
+            contact = CONTACT_MODELS[is_pending].objects.get(
                 pk=request.data.get('contact_id')
             )
         except Exception:
             raise Http404('No %s matches the given query.' %
-                          object_map[is_pending]._meta.object_name)
+                          CONTACT_MODELS[is_pending]._meta.object_name)
 
         contact.shared_with.add(*serializer.validated_data['shared_with'])
 
@@ -294,75 +342,49 @@ class MediatorViewSet(
 
     @action(detail=True, methods=['GET'])
     def leads_and_clients(self, request, *args, **kwargs):
-        """ Возвращает лиды адвоката и клиентов. """
-        mediator = get_object_or_404(self.queryset, **kwargs)
+        """ Возвращает лиды адвоката и клиентов.
+        Клиенты и приглашения объединяются и разбиваются на страницы в БД,
+        полностью загружаются только записи текущей страницы.
+        """
+        mediator = self.get_object()
         try:
             search_filter = LeadClientSearchFilter()
             type_filter = LeadClientFilter()
 
-            leads_clients = Client.mediator_clients_and_leads(mediator).\
-                select_related(
-                    'user',
-                    'country',
-                    'state',
-                    'city',
-                    'city__region',
-                ).prefetch_related(
-                    Prefetch(
-                        'matters',
-                        queryset=Matter.objects.filter(mediator=mediator)
-                    ),
-                    Prefetch(
-                        'leads',
-                        queryset=Lead.objects.filter(
-                            status=Lead.STATUS_CONVERTED, mediator=mediator
-                        )
-                    ),
-                ).distinct()
+            leads_clients = Client.mediator_clients_and_leads(mediator)
             leads_clients = search_filter.search_lead_client(
                 request, leads_clients
             )
             leads_clients = type_filter.filter_type(request, leads_clients)
 
-            invites = Invite.get_pending_mediator_invites(mediator).\
-                select_related(
-                    'country',
-                    'state',
-                    'city',
-                    'city__region',
-                ).prefetch_related(
-                    'matters'
-                )
+            invites = Invite.get_pending_mediator_invites(mediator)
             invites = search_filter.search_lead_client(request, invites)
             invites = type_filter.filter_type(request, invites)
 
-            leads_and_clients = set(leads_clients) | set(invites)
+            contacts = project_contacts(
+                Client, leads_clients, False, LEAD_CLIENT_CLIENT_COLUMNS
+            ).union(
+                project_contacts(
+                    Invite, invites, True, LEAD_CLIENT_INVITE_COLUMNS
+                ),
+                all=True
+            )
+            contacts, python_ordering = order_contacts(
+                contacts,
+                request.GET.getlist('ordering', []),
+                LEAD_CLIENT_CLIENT_COLUMNS
+            )
 
-            page = self.paginate_queryset(queryset=list(leads_and_clients))
-            ordering_fields = request.GET.getlist('ordering', [])
-            if page is not None:
-                serializer = LeadAndClientSerializer(
-                    page,
-                    many=True,
-                    context={'request': request}
-                )
-            else:
-                serializer = LeadAndClientSerializer(
-                    leads_and_clients,
-                    many=True,
-                    context={'request': request}
-                )
-            data = serializer.data
-            for field in ordering_fields:
-                reverse = False
-                if field.startswith('-'):
-                    reverse = True
-                    field = field[1:]
-                data = sorted(
-                    data,
-                    key=lambda k: (k[field] is not None, k[field]),
-                    reverse=reverse
-                )
+            page = self.paginate_queryset(queryset=contacts)
+            leads_and_clients = self.get_leads_and_clients(
+                mediator, page if page is not None else contacts
+            )
+            serializer = LeadAndClientSerializer(
+                leads_and_clients,
+                many=True,
+                context={'request': request}
+            )
+            data = sort_contacts_data(serializer.data, python_ordering)
             if page is not None:
                 return self.get_paginated_response(data)
             else:
@@ -375,36 +397,68 @@ class MediatorViewSet(
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    def get_leads_and_clients(self, mediator, contacts):
+        """ Загрузите клиентов и приглашения по строкам `project_contacts`.
+        Порядок строк сохраняется.
+        """
+        client_ids = [row[0] for row in contacts if not row[1]]
+        invite_ids = [row[0] for row in contacts if row[1]]
+        clients = Client.objects.filter(pk__in=client_ids).select_related(
+            'user',
+            'country',
+            'state',
+            'city',
+            'city__region',
+        )
+        invites = Invite.objects.filter(pk__in=invite_ids).select_related(
+            'country',
+            'state',
+            'city',
+            'city__region',
+        )
+        # ключ включает `is_pending`, чтобы id разных моделей не совпадали
+        objects = {(False, str(obj.pk)): obj for obj in clients}
+        objects.update({(True, str(obj.pk)): obj for obj in invites})
+        return LeadAndClientSerializer.setup_eager_loading(
+            [
+                objects[row[1], row[0]] for row in contacts
+                if (row[1], row[0]) in objects
+            ],
+            mediator
+        )
+
     @action(detail=True, methods=['DELETE'])
     def remove_leads_and_clients(self, request, *args, **kwargs):
         """ Удаление потенциальных клиентов из списка контактов """
         mediator = self.get_object()
-        try:
-            user_id = request.data.get('user_id', None)
-            is_invite = False
-            try:
-                is_invite = not isinstance(int(user_id), int)
-            except ValueError:
-                is_invite = True
-            if is_invite:
-                Invite.objects.filter(uuid=user_id).delete()
-            else:
-                Lead.objects.filter(
-                    mediator=mediator, client=user_id
-                ).delete()
-                Matter.objects.filter(
-                    mediator=mediator, client=user_id
-                ).delete()
+        user_id = request.data.get('user_id', None)
+        if user_id is None:
             return Response(
-                data={"success": True},
-                status=status.HTTP_200_OK,
+                data={"success": False},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        except Exception as e:
-            print(e)
+        try:
+            # лиды и дела удаляются вместе или не удаляются вовсе
+            with transaction.atomic():
+                if is_invite_id(user_id):
+                    Invite.objects.filter(uuid=user_id).delete()
+                else:
+                    Lead.objects.filter(
+                        mediator=mediator, client=user_id
+                    ).delete()
+                    Matter.objects.filter(
+                        mediator=mediator, client=user_id
+                    ).delete()
+        except ValidationError:
+            # неверный uuid приглашения
             return Response(
                 data={"success": False},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        return Response(
+            data={"success": True},
+            status=status.HTTP_200_OK,
+        )
 
     @action(detail=True, methods=['POST'])
     def change_user_type(self, request, *args, **kwargs):
@@ -412,40 +466,43 @@ class MediatorViewSet(
         mediator = self.get_object()
         user_id = request.data.get('user_id')
         type = request.data.get('type', 'client')
-        print("type", type)
-        try:
-            is_invite = False
-            try:
-                is_invite = not isinstance(int(user_id), int)
-            except ValueError:
-                is_invite = True
-            if is_invite:
-                print("is_invite", is_invite)
-                Invite.objects.filter(uuid=user_id).update(client_type=type)
-            else:
-                lead = mediator.leads.get(client=user_id)
-                print("lead", lead.id)
-                if type == 'client':
-                    lead.status = Lead.STATUS_CONVERTED
-                elif type == 'lead' and \
-                        Matter.objects.filter(
-                            client=lead.client, mediator=mediator
-                        ).count() == 0:
-                    lead.status = Lead.STATUS_ACTIVE
-                else:
-                    return Response(
-                        data={
-                            "success": False,
-                            "detail": "Client who has matters can not changed"
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                lead.save()
-        except Lead.DoesNotExist:
+        if user_id is None:
             return Response(
                 data={"success": False},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if is_invite_id(user_id):
+            Invite.objects.filter(uuid=user_id).update(client_type=type)
+            return Response(
+                data={"success": True},
+                status=status.HTTP_200_OK
+            )
+
+        if type == 'client':
+            lead_status = Lead.STATUS_CONVERTED
+        elif type == 'lead' and not Matter.objects.filter(
+            client=user_id, mediator=mediator
+        ).exists():
+            lead_status = Lead.STATUS_ACTIVE
+        else:
+            return Response(
+                data={
+                    "success": False,
+                    "detail": "Client who has matters can not changed"
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # статус обновляется одним запросом, `update()` не отправляет
+        # `post_save`, поэтому кэш статистики сбрасывается явно
+        updated = mediator.leads.filter(client=user_id).update(
+            status=lead_status, modified=timezone.now()
+        )
+        if not updated:
+            return Response(
+                data={"success": False},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        services.invalidate_mediator_statistics(mediator.pk)
         return Response(
             data={"success": True},
             status=status.HTTP_200_OK
@@ -455,7 +512,7 @@ class MediatorViewSet(
     def industry_contacts(self, request, *args, **kwargs):
         """ Возвращает контакты юриста в отрасли """
 
-        mediator = get_object_or_404(self.queryset, **kwargs)
+        mediator = self.get_object()
         filterer = IndustryContactsSearchFilter()
         type_filterer = IndustryContactsTypeFilter()
 
@@ -468,37 +525,59 @@ class MediatorViewSet(
         contacts = filterer.filter_queryset(request, contacts, None)
         contacts = type_filterer.filter_contact_type(request, contacts)
 
-        industry_contacts = set(invites) | set(contacts)
+        industry_contacts = project_contacts(
+            User, contacts, False, INDUSTRY_CONTACT_COLUMNS
+        ).union(
+            project_contacts(Invite, invites, True, INDUSTRY_CONTACT_COLUMNS),
+            all=True
+        )
+        industry_contacts, python_ordering = order_contacts(
+            industry_contacts,
+            request.GET.getlist('ordering', []),
+            INDUSTRY_CONTACT_COLUMNS
+        )
 
-        page = self.paginate_queryset(queryset=list(industry_contacts))
-        ordering_fields = request.GET.getlist('ordering', [])
+        page = self.paginate_queryset(queryset=industry_contacts)
+        serializer = IndustryContactSerializer(
+            self.get_industry_contacts(
+                page if page is not None else industry_contacts
+            ),
+            many=True
+        )
+        data = sort_contacts_data(serializer.data, python_ordering)
         if page is not None:
-            serializer = IndustryContactSerializer(page, many=True)
-        else:
-            serializer = IndustryContactSerializer(
-                industry_contacts,
-                many=True
-            )
-
-        data = serializer.data
-        for field in ordering_fields:
-            reverse = False
-            if field.startswith('-'):
-                reverse = True
-                field = field[1:]
-            data = sorted(
-                data,
-                key=lambda k: (k[field] is not None, k[field]),
-                reverse=reverse
-            )
+            return self.get_paginated_response(data)
+        return Response(
+            data=data,
+            status=status.HTTP_200_OK
+        )
 
-        if page is not None:
-            return self.paginator.get_paginated_response(data)
-        else:
-            return Response(
-                data=serializer.data,
-                status=status.HTTP_200_OK
-            )
+    def get_industry_contacts(self, contacts):
+        """ Загрузите пользователей и приглашения по строкам `project_contacts`.
+        Порядок строк сохраняется.
+        """
+        user_ids = [row[0] for row in contacts if not row[1]]
+        invite_ids = [row[0] for row in contacts if row[1]]
+        users = User.objects.filter(pk__in=user_ids).select_related(
+            'client', 'mediator', 'support', 'owned_enterprise'
+        )
+        # загружаются только колонки, которые выводит сериализатор
+        invites = Invite.objects.filter(pk__in=invite_ids).only(
+            'uuid',
+            'first_name',
+            'last_name',
+            'email',
+            'phone',
+            'user_type',
+            'user',
+        )
+        # ключ включает `is_pending`, чтобы id разных моделей не совпадали
+        objects = {(False, str(obj.pk)): obj for obj in users}
+        objects.update({(True, str(obj.pk)): obj for obj in invites})
+        return [
+            objects[row[1], row[0]] for row in contacts
+            if (row[1], row[0]) in objects
+        ]
 
     @action(detail=True, methods=['GET'])
     def industry_contact_detail(self, request, *args, **kwargs):
@@ -509,10 +588,10 @@ class MediatorViewSet(
             return Http404('Invalid request data.')
 
         try:
-            contact = get_user_model().objects.get(pk=user_id)
+            contact = User.objects.get(pk=user_id)
         except Exception:
             raise Http404('No %s matches the given query.' %
-                          get_user_model()._meta.object_name)
+                          User._meta.object_name)
 
 
         serializer = IndustryContactMediatorDetails(contact)
@@ -532,7 +611,7 @@ class MediatorViewSet(
             raise Http404('Invalid request data.')
 
         try:
-            new_industry_contact = get_user_model().objects.get(pk=user_id)
+            new_industry_contact = User.objects.get(pk=user_id)
             #if new_industry_contact.user_type == 'client':
             #    raise Http404('Invalid request data.')
             mediator.industry_contacts.add(
@@ -542,7 +621,7 @@ class MediatorViewSet(
                 status=status.HTTP_200_OK,
                 data={"success": True}
             )
-        except get_user_model().DoesNotExist:
+        except User.DoesNotExist:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={"success": False}
@@ -559,13 +638,13 @@ class MediatorViewSet(
 
         try:
             mediator.industry_contacts.remove(
-                get_user_model().objects.get(pk=user_id)
+                User.objects.get(pk=user_id)
             )
             return Response(
                 status=status.HTTP_200_OK,
                 data={"success": True}
             )
-        except get_user_model().DoesNotExist:
+        except User.DoesNotExist:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={"success": False}
@@ -606,22 +685,9 @@ class MediatorViewSet(
         # Проверка разрешений адвоката.
         # адвокат = self.get_object()
 
-        object_map = {
-            True: Invite,
-            False: Client
-        }
-        from apps.users.api.serializers import (
-            UpdateClientSerializer,
-            UpdateInviteSerializer,
-        )
-
-        serializer_map = {
-            True: UpdateInviteSerializer,
-            False: UpdateClientSerializer
-        }
         is_pending = request.data.get('is_pending', False)
 
-        contact_model = object_map.get(is_pending)
+        contact_model = CONTACT_MODELS.get(is_pending)
         contact_id = request.data.get('contact_id')
 
         try:
@@ -632,7 +698,7 @@ class MediatorViewSet(
         if not contact:
             raise Http404('Invalid contact details.')
 
-        serializer_class = serializer_map[is_pending]
+        serializer_class = CONTACT_UPDATE_SERIALIZERS[is_pending]
         serializer = serializer_class(
             instance=contact,
             data=request.data['contact_data'],
@@ -655,14 +721,11 @@ class MediatorViewSet(
 
         mediator = self.request.user.mediator
 
+        # адвокат уже известен, поэтому присоединяются только данные заявки
         proposals = Proposal.objects.filter(mediator=mediator).select_related(
-            'mediator',
-            'mediator__user',
-            'currency'
-        ).prefetch_related(
             'post',
             'post__practice_area',
-            'post__client',
+            'post__client__user',
         )
 
         status_required = request.GET.get('status')
@@ -686,10 +749,15 @@ class MediatorViewSet(
             proposals = proposals.filter(is_hidden_for_mediator=False)
         page = self.paginate_queryset(proposals)
         if page is not None:
+            for proposal in page:
+                proposal.mediator = mediator
             serializer = MediatorProposalSerializer(page, many=True)
             return self.paginator.get_paginated_response(data=serializer.data)
 
-        serializer = MediatorProposalSerializer(mediator)
+        proposals = list(proposals)
+        for proposal in proposals:
+            proposal.mediator = mediator
+        serializer = MediatorProposalSerializer(proposals, many=True)
         return Response(
             data=serializer.data,
             status=status.HTTP_200_OK
@@ -698,31 +766,12 @@ class MediatorViewSet(
     @action(methods=['get'], detail=True)
     def get_all_contacts(self, request, *args, **kwargs):
         mediator = self.get_object()
-        industry_contacts = set(
-            mediator.industry_contacts.values_list(
-                'id', flat=True
-            )
-        )
-        opportunities = set(
-            mediator.opportunities.values_list(
-                'client__user', flat=True
-            )
-        )
-        leads = set(
-            mediator.leads.values_list(
-                'client__user',
-                flat=True
-            )
-        )
-        clients = set(
-            mediator.matters.values_list(
-                'client__user',
-                flat=True
-            )
-        )
-        contacts = industry_contacts | opportunities | leads | clients
-        mediator_contacts = get_user_model().objects.filter(
-            id__in=contacts
+        # все контакты выбираются одним запросом с подзапросами
+        mediator_contacts = User.objects.filter(
+            Q(id__in=mediator.industry_contacts.values('id')) |
+            Q(id__in=mediator.opportunities.values('client__user')) |
+            Q(id__in=mediator.leads.values('client__user')) |
+            Q(id__in=mediator.matters.values('client__user'))
         )
 
         page = self.paginate_queryset(mediator_contacts)
@@ -744,8 +793,8 @@ class MediatorViewSet(
         try:
             mediator = self.get_object()
             enterprise_id = request.data.get('enterprise', None)
-            enterprise = Enterprise.objects.get(pk=enterprise_id)
-            if mediator.enterprise != enterprise:
+            if mediator.enterprise_id is None or \
+                    str(mediator.enterprise_id) != str(enterprise_id):
                 return Response(
                     status=status.HTTP_400_BAD_REQUEST,
                     data={
@@ -754,12 +803,15 @@ class MediatorViewSet(
                                   "enterprise with id={}".format(enterprise_id)
                     }
                 )
-            mediator.enterprise = None
-            mediator.save()
-            EnterpriseMembers.objects.filter(
-                enterprise=enterprise,
-                user=request.user
-            ).delete()
+            with transaction.atomic():
+                # обновляется только связь с предприятием, сигналы
+                # сохранения адвоката (сброс кэша профиля) сохраняются
+                mediator.enterprise = None
+                mediator.save(update_fields=('enterprise', 'modified'))
+                EnterpriseMembers.objects.filter(
+                    enterprise_id=enterprise_id,
+                    user=request.user
+                ).delete()
             return Response(
                 data={"success": True},
                 status=status.HTTP_200_OK
@@ -865,7 +917,11 @@ class CurrentMediatorActionsViewSet(BaseViewSet):
 
         """
         return Response(
-            data=services.get_mediator_statistics(request.user.mediator),
+            data=services.get_cached_mediator_statistics(
+                request.user.mediator,
+                'current',
+                services.get_mediator_statistics,
+            ),
         )
 
     @action(methods=['get'], url_path='statistics/period', detail=False)
@@ -887,7 +943,10 @@ class CurrentMediatorActionsViewSet(BaseViewSet):
         )
         serializer.is_valid(raise_exception=True)
         return Response(
-            data=services.get_mediator_period_statistic(
-                request.user.mediator, **serializer.data
+            data=services.get_cached_mediator_statistics(
+                request.user.mediator,
+                'period',
+                services.get_mediator_period_statistic,
+                **serializer.data
             )
         )
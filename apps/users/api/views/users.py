@@ -114,7 +114,9 @@ class AppUserViewSet(ReadOnlyViewSet):
         """Get 2-Factor Authentication flag"""
         qp = self.request.query_params
         try:
-            user = AppUser.objects.get(email__iexact=qp.get('email').strip())
+            user = AppUser.objects.get(
+                email=qp.get('email').strip().lower()
+            )
             return Response(
                 status=status.HTTP_200_OK,
                 data=AppUserTwoFASerializer(instance=user).data
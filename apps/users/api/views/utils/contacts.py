@@ -0,0 +1,121 @@
+from functools import cmp_to_key
+
+from django.db.models import BooleanField, CharField, F, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+
+# Колонки контактов, по которым можно сортировать в БД: ключ ответа ->
+# путь к полю модели (или выражение) для клиентов/пользователей и приглашений
+LEAD_CLIENT_CLIENT_COLUMNS = {
+    'first_name': 'user__first_name',
+    'middle_name': 'user__middle_name',
+    'last_name': 'user__last_name',
+    'email': 'user__email',
+    'phone': 'user__phone',
+    'company': 'organization_name',
+    'note': 'note',
+    'zipcode': 'zip_code',
+}
+LEAD_CLIENT_INVITE_COLUMNS = {
+    'first_name': 'first_name',
+    'middle_name': 'middle_name',
+    'last_name': 'last_name',
+    'email': 'email',
+    'phone': 'phone',
+    'company': 'organization_name',
+    'note': 'note',
+    'zipcode': 'zip_code',
+}
+INDUSTRY_CONTACT_COLUMNS = {
+    'name': Concat('first_name', Value(' '), 'last_name'),
+    'email': 'email',
+    'phone': 'phone',
+}
+
+COLUMN_ALIAS = 'contact_{}'
+
+
+def is_invite_id(contact_id):
+    """ Проверьте, является ли идентификатор контакта uuid приглашения.
+    Зарегистрированные контакты передаются числовым id пользователя.
+    """
+    if isinstance(contact_id, int):
+        return False
+    return not str(contact_id).isdigit()
+
+
+def project_contacts(model, queryset, is_pending, columns):
+    """ Спроецируйте контакты адвоката в строки (id, is_pending, колонки).
+
+    Строки разных моделей имеют одинаковые колонки, поэтому их можно
+    объединить через UNION, отсортировать и разбить на страницы в БД.
+    `queryset` может быть пустым набором запросов другой модели.
+    """
+    # пустые значения заменяются на '', чтобы они шли первыми при
+    # сортировке по возрастанию и последними при сортировке по убыванию
+    annotations = {
+        COLUMN_ALIAS.format(name): Coalesce(
+            Cast(
+                F(column) if isinstance(column, str) else column,
+                output_field=CharField()
+            ),
+            Value('')
+        )
+        for name, column in columns.items()
+    }
+    return model.objects.filter(
+        pk__in=queryset.values('pk')
+    ).annotate(
+        contact_id=Cast('pk', output_field=CharField()),
+        is_pending=Value(is_pending, output_field=BooleanField()),
+        **annotations
+    ).values_list('contact_id', 'is_pending', *annotations)
+
+
+def order_contacts(contacts, ordering, columns):
+    """ Отсортируйте объединенные контакты в БД.
+
+    Параметры применяются как последовательные устойчивые сортировки,
+    т.е. последний параметр главный, а пустые значения идут первыми при
+    сортировке по возрастанию. Возвращает набор запросов и параметры,
+    которые нельзя отсортировать в БД.
+    """
+    order_by = []
+    python_ordering = []
+    for field in reversed(ordering):
+        name = field.lstrip('-')
+        if name not in columns:
+            python_ordering.insert(0, field)
+            continue
+        # объединенные запросы сортируются только по именам колонок
+        order_by.append(
+            ('-' if field.startswith('-') else '') + COLUMN_ALIAS.format(name)
+        )
+    return contacts.order_by(
+        *order_by, 'is_pending', 'contact_id'
+    ), python_ordering
+
+
+def sort_contacts_data(data, ordering):
+    """ Отсортируйте сериализованные контакты по полям, которых нет в БД.
+
+    Данные сортируются один раз, последний параметр главный, как и при
+    сортировке в БД. Пустые значения идут первыми по возрастанию.
+    """
+    fields = [
+        (field.lstrip('-'), field.startswith('-'))
+        for field in reversed(ordering)
+    ]
+    if not fields:
+        return data
+
+    def compare(first, second):
+        for field, reverse in fields:
+            first_key = (first[field] is not None, first[field])
+            second_key = (second[field] is not None, second[field])
+            if first_key == second_key:
+                continue
+            result = -1 if first_key < second_key else 1
+            return -result if reverse else result
+        return 0
+
+    return sorted(data, key=cmp_to_key(compare))
@@ -1,4 +1,5 @@
 from django.contrib import messages
+from django.db.transaction import on_commit
 from django.http import HttpResponseRedirect
 
 from allauth.account import signals
@@ -12,16 +13,31 @@ from allauth.account.utils import (
 )
 from allauth.exceptions import ImmediateHttpResponse
 
+from apps.users import tasks
+
+
+def send_email_confirmation_async(request, user, signup=False):
+    """
+    Schedule confirmation email sending to celery once the current
+    transaction is committed, so SMTP doesn't block the request.
+    """
+    on_commit(
+        lambda: tasks.send_email_confirmation_task.delay(user.pk, signup)
+    )
+
 
 def perform_login(request, user, email_verification,
                   redirect_url=None, signal_kwargs=None,
-                  signup=False):
+                  signup=False, send_async=False):
     """
     Keyword arguments:
 
     signup -- Indicates whether or not sending the
     email is essential (during signup), or if it can be skipped (e.g. in
     case email verification is optional and we are only logging in).
+
+    send_async -- Send confirmation email from celery task instead of
+    request cycle.
     """
     adapter = get_adapter(request)
     # Skip module checking `is_active` because this value is updated
@@ -29,14 +45,18 @@ def perform_login(request, user, email_verification,
     # if not user.is_active:
     #     return adapter.respond_user_inactive(request, user)
 
+    send_confirmation = (
+        send_email_confirmation_async if send_async
+        else send_email_confirmation
+    )
     has_verified_email = EmailAddress.objects.filter(user=user,
                                                      verified=True).exists()
     if email_verification == EmailVerificationMethod.OPTIONAL:
         if not has_verified_email and signup:
-            send_email_confirmation(request, user, signup=signup)
+            send_confirmation(request, user, signup=signup)
     elif email_verification == EmailVerificationMethod.MANDATORY:
         if not has_verified_email:
-            send_email_confirmation(request, user, signup=signup)
+            send_confirmation(request, user, signup=signup)
             return adapter.respond_email_verification_sent(
                 request, user)
     try:
@@ -62,7 +82,7 @@ def perform_login(request, user, email_verification,
 
 
 def complete_signup(request, user, email_verification, success_url,
-                    signal_kwargs=None):
+                    signal_kwargs=None, send_async=False):
     if signal_kwargs is None:
         signal_kwargs = {}
     signals.user_signed_up.send(sender=user.__class__,
@@ -73,7 +93,8 @@ def complete_signup(request, user, email_verification, success_url,
                          email_verification=email_verification,
                          signup=True,
                          redirect_url=success_url,
-                         signal_kwargs=signal_kwargs)
+                         signal_kwargs=signal_kwargs,
+                         send_async=send_async)
 
 
 def resend_email_confirmation(request, user, signup=False):
@@ -13,6 +13,7 @@ from .mediators import (
     MediatorFactory,
     MediatorFactoryWithAllInfo,
     MediatorVerifiedFactory,
+    MinimalMediatorFactory,
 )
 from .clients import ClientFactory
 from .support import (
@@ -45,6 +46,7 @@ __all__ = (
     'MediatorFactory',
     'MediatorFactoryWithAllInfo',
     'MediatorVerifiedFactory',
+    'MinimalMediatorFactory',
     'MediatorEducationFactory',
     'MediatorRegistrationAttachmentFactory',
     'UniversityFactory',
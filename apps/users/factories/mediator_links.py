@@ -53,7 +53,9 @@ class MediatorEducationFactory(factory.DjangoModelFactory):
 class MediatorRegistrationAttachmentFactory(factory.DjangoModelFactory):
     """Factory for generating registration attachments for mediator."""
     mediator = factory.SubFactory('mediator.MediatorFactory')
-    attachment = factory.django.ImageField(color='magenta')
+    # attachment stores only url of uploaded file, so there is no need to
+    # render real image for it
+    attachment = factory.Faker('file_path', extension='png')
 
     class Meta:
         model = MediatorRegistrationAttachment
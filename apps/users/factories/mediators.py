@@ -1,16 +1,15 @@
 import random
 
 from django.contrib.gis.geos import Point
-from django.test import override_settings
 
 import factory
 import faker
-from cities_light.management.commands import cities_light
 from factory.fuzzy import FuzzyDecimal, FuzzyInteger
 
-from ..models import Mediator
+from ..models import Jurisdiction, Mediator, MediatorRegistrationAttachment
 from .mediator_links import (
     MediatorEducationFactory,
+    MediatorRegistrationAttachmentFactory,
     FeeKindFactory,
     SpecialityFactory,
 )
@@ -18,6 +17,37 @@ from .mediator_links import (
 fake = faker.Faker()
 
 
+def get_or_create_batch(factory_class, size, unique=False):
+    """Get `size` existing objects of factory model or create missing ones.
+
+    Reference data like specialities doesn't need to be unique for most
+    tests, so existing rows are reused unless `unique` is set. Rows are
+    looked up in db every time (instead of caching pks in process), since
+    tests roll back created objects.
+
+    """
+    if unique:
+        return factory_class.create_batch(size=size)
+    model = factory_class._meta.model
+    objects = list(model.objects.order_by('pk')[:size])
+    if len(objects) < size:
+        objects += factory_class.create_batch(size=size - len(objects))
+    return objects
+
+
+def set_random_jurisdictions(mediator, size):
+    """Set up to `size` random existing practice jurisdictions of mediator.
+
+    Only primary keys are loaded, since `set()` accepts them directly.
+
+    """
+    pks = list(Jurisdiction.objects.values_list('pk', flat=True))
+    if pks:
+        mediator.practice_jurisdictions.set(
+            random.sample(pks, k=min(size, len(pks)))
+        )
+
+
 class MediatorFactory(factory.DjangoModelFactory):
     """Factory for generating test Mediator model."""
 
@@ -33,11 +63,6 @@ class MediatorFactory(factory.DjangoModelFactory):
     firm_location_state = factory.Faker('state')
     firm_location_data = {}
     keywords = factory.Faker('words')
-    registration_attachments = factory.RelatedFactoryList(
-        'apps.users.factories.MediatorRegistrationAttachmentFactory',
-        'mediator',
-        size=2
-    )
 
     user = factory.SubFactory('apps.users.factories.AppUserFactory')
 
@@ -53,16 +78,48 @@ class MediatorFactory(factory.DjangoModelFactory):
     def phone(self):
         return fake.numerify('+12125552###')
 
+    @factory.post_generation
+    def registration_attachments(self, create, extracted, size=2, **kwargs):
+        """Create registration attachments of mediator in one query."""
+        if not create:
+            return
+        MediatorRegistrationAttachment.objects.bulk_create(
+            MediatorRegistrationAttachmentFactory.build_batch(
+                size=size, mediator=self
+            )
+        )
+
     @factory.post_generation
     def extra_info(self, *args, **kwargs):
-        """Fill Mediator with related models."""
-        specialities = SpecialityFactory.create_batch(size=2)
-        for speciality in specialities:
-            self.user.specialities.add(speciality)
+        """Fill Mediator with related models.
+
+        Pass `extra_info__unique=True` to create new specialities instead
+        of reusing existing ones.
+
+        """
+        specialities = get_or_create_batch(
+            SpecialityFactory, size=2, unique=kwargs.get('unique', False)
+        )
+        self.user.specialities.add(*specialities)
+
+        set_random_jurisdictions(self, size=2)
+
+
+class MinimalMediatorFactory(MediatorFactory):
+    """Create mediator without registration attachments and related models.
+
+    Use it in tests which need some mediator, but don't check its
+    specialities, jurisdictions or attachments.
+
+    """
+
+    @factory.post_generation
+    def registration_attachments(self, *args, **kwargs):
+        """Skip creation of registration attachments."""
 
-        regions = cities_light.Region.objects.all()
-        if regions:
-            self.practice_jurisdictions.set(random.choices(regions, k=2))
+    @factory.post_generation
+    def extra_info(self, *args, **kwargs):
+        """Skip filling of related models."""
 
 
 class MediatorVerifiedFactory(MediatorFactory):
@@ -73,12 +130,16 @@ class MediatorVerifiedFactory(MediatorFactory):
     )
 
     @factory.post_generation
-    @override_settings(STRIPE_ENABLED=False)
     def verify_mediator(self: Mediator, create, extracted, **kwargs):
-        """Set `STRIPE_ENABLED = False` for success verification"""
+        """Verify created mediator.
+
+        `verify()` saves user itself and doesn't create stripe subscription,
+        so there is no need to override settings or save user again.
+
+        """
+        if not create:
+            return
         self.verify()
-        self.user.has_active_subscription = True
-        self.user.save()
 
 
 class MediatorFactoryWithAllInfo(MediatorVerifiedFactory):
@@ -102,28 +163,28 @@ class MediatorFactoryWithAllInfo(MediatorVerifiedFactory):
 
     @factory.post_generation
     def extra_info(self: Mediator, *args, **kwargs):
-        """Fill Mediator with related models."""
-        specialities = SpecialityFactory.create_batch(size=2)
-        for speciality in specialities:
-            self.user.specialities.add(speciality)
+        """Fill Mediator with related models.
 
-        regions = cities_light.Region.objects.all()
-        self.practice_jurisdictions.set(random.choices(regions, k=2))
+        Pass `extra_info__unique=True` to create new specialities and fee
+        types instead of reusing existing ones.
 
-        fee_types = FeeKindFactory.create_batch(size=2)
-        for fee_type in fee_types:
-            self.fee_types.add(fee_type)
-
-        educations = MediatorEducationFactory.create_batch(
-            mediator=self,
-            size=2
+        """
+        unique = kwargs.get('unique', False)
+        specialities = get_or_create_batch(
+            SpecialityFactory, size=2, unique=unique
         )
-        for education in educations:
-            self.education.add(education)
+        self.user.specialities.add(*specialities)
+
+        set_random_jurisdictions(self, size=2)
+
+        fee_types = get_or_create_batch(FeeKindFactory, size=2, unique=unique)
+        self.fee_types.add(*fee_types)
+
+        # educations are created already linked to mediator
+        MediatorEducationFactory.create_batch(mediator=self, size=2)
 
         # Escape import error
         from .users import ClientFactory
 
         followers = ClientFactory.create_batch(size=2)
-        for follower in followers:
-            self.followers.add(follower.user)
+        self.followers.add(*[follower.user for follower in followers])
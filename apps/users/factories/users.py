@@ -16,7 +16,9 @@ class AppUserFactory(factory.DjangoModelFactory):
     """
     first_name = factory.Faker('first_name')
     last_name = factory.Faker('last_name')
-    avatar = factory.django.ImageField(color='magenta')
+    # avatar stores only url of uploaded file, use `AppUserWithAvatarFactory`
+    # when real image is needed
+    avatar = factory.Faker('file_path', extension='png')
 
     password = factory.PostGenerationMethodCall('set_password', 'password')
 
@@ -0,0 +1,61 @@
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Lower
+from allauth.account.models import EmailAddress
+from ...models import AppUser
+
+
+class Command(BaseCommand):
+    """ Приведите электронные почты пользователей к нижнему регистру.
+    Обновляются `AppUser.email` и `EmailAddress.email` из allauth.
+    Адреса, которые отличаются только регистром, не изменяются, а выводятся
+    в отчет, чтобы их объединили вручную.
+    Команда обязательна при развертывании: поиск пользователей по почте
+    сравнивает адреса на равенство с почтой в нижнем регистре.
+    """
+    help = 'Lowercase emails of users and allauth email addresses'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report emails which would be changed',
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            for model in (AppUser, EmailAddress):
+                self.lowercase_emails(model, options['dry_run'])
+
+    def lowercase_emails(self, model, dry_run: bool):
+        """ Приведите почты модели к нижнему регистру, кроме дубликатов. """
+        name = model._meta.label
+        duplicates = set(
+            model.objects.annotate(email_lower=Lower('email'))
+            .values('email_lower')
+            .annotate(count=Count('pk'))
+            .filter(count__gt=1)
+            .values_list('email_lower', flat=True)
+        )
+        for email in sorted(duplicates):
+            emails = model.objects.filter(email__iexact=email) \
+                .values_list('email', flat=True)
+            self.stdout.write(self.style.WARNING(
+                f'{name}: case-only duplicates {", ".join(emails)}'
+            ))
+
+        to_update = model.objects.exclude(email=Lower('email')).annotate(
+            email_lower=Lower('email')
+        ).exclude(email_lower__in=duplicates)
+        if dry_run:
+            count = to_update.count()
+        else:
+            count = model.objects.filter(
+                pk__in=list(to_update.values_list('pk', flat=True))
+            ).update(email=Lower('email'))
+        action = 'to lowercase' if dry_run else 'lowercased'
+        self.stdout.write(
+            f'{name}: {count} emails {action}, '
+            f'{len(duplicates)} duplicates skipped'
+        )
@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+from ...models import AppUser
+
+
+class Command(BaseCommand):
+    """ Заполните поисковые векторы всех пользователей.
+    Векторы обновляются сигналом при сохранении пользователя, команда
+    нужна один раз после добавления поля `AppUser.search_vector`, а также
+    после изменений пользователей через `update()`.
+    """
+    help = 'Fill search vectors of all users'
+
+    def handle(self, *args, **options) -> None:
+        count = AppUser.objects.update_search_vector()
+        self.stdout.write(f'{count} search vectors updated')
@@ -195,26 +195,49 @@ class Client(AppUserHelperMixin, AbstractClient):
 
     @classmethod
     def mediator_clients_and_leads(cls, mediator):
-        """ Возвращает лиды и клиентов для адвоката """
-        # только зацепки
-        leads = cls.objects.exclude(
-            matters__mediator__in=[mediator.pk],
-        ).filter(
-            leads__mediator__in=[mediator.pk]
-        ).distinct()
-        # фактические клиенты с вопросами
-        clients = cls.objects.filter(
-            matters__mediator__in=[mediator.pk],
-        ).distinct()
-
-        return leads | clients
+        """ Возвращает лиды и клиентов для адвоката.
+        Контакты выбираются подзапросами без соединений, поэтому дубликатов
+        нет и `distinct()` не нужен. Аннотации `has_matters` и
+        `is_converted` показывают, является ли контакт клиентом адвоката.
+        """
+        from ...business.models import Lead, Matter
+        leads = Lead.objects.filter(mediator=mediator)
+        matters = Matter.objects.filter(mediator=mediator)
+        return cls.objects.filter(
+            models.Q(pk__in=leads.values('client')) |
+            models.Q(pk__in=matters.values('client'))
+        ).annotate(
+            has_matters=models.Exists(
+                matters.filter(client=models.OuterRef('pk'))
+            ),
+            is_converted=models.Exists(
+                leads.filter(
+                    client=models.OuterRef('pk'),
+                    status=Lead.STATUS_CONVERTED
+                )
+            ),
+        )
 
     def contacts(self):
-        """ Верните адвокатов, с которыми клиент находится в контакте """
-        contacts = set(self.leads.values_list('mediator__user', flat=True))
-        contacts |= set(self.leads.values_list('enterprise__user', flat=True))
-        contacts |= set(self.matters.values_list('mediator__user', flat=True))
-        contacts |= set(self.opportunities.values_list(
-            'mediator__user', flat=True
-        ))
-        return contacts
+        """ Верните адвокатов, с которыми клиент находится в контакте.
+        Id пользователей выбираются одним запросом с UNION, первичный ключ
+        адвоката совпадает с id его пользователя. Строки читаются итератором,
+        чтобы не держать кэш набора запросов вместе с множеством.
+        """
+        leads = self.leads.filter(mediator__isnull=False).values_list(
+            'mediator_id', flat=True
+        )
+        enterprises = self.leads.filter(
+            enterprise__isnull=False
+        ).values_list('enterprise__user_id', flat=True)
+        matters = self.matters.filter(mediator__isnull=False).values_list(
+            'mediator_id', flat=True
+        )
+        opportunities = self.opportunities.values_list(
+            'mediator_id', flat=True
+        )
+        return set(
+            leads.union(enterprises, matters, opportunities).iterator(
+                chunk_size=1000
+            )
+        )
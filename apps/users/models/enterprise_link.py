@@ -31,7 +31,7 @@ class Member(BaseModel):
         return self.email
 
     def _send_invitation(self, enterprise, type):
-        if not AppUser.objects.filter(email__iexact=self.email).exists():
+        if not AppUser.objects.filter(email=self.email.lower()).exists():
             notifications.EnterpriseMemberInvitationNotification(
                 member=self,
                 enterprise=enterprise,
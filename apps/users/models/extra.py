@@ -126,6 +126,9 @@ class Jurisdiction(BaseModel):
     class Meta:
         verbose_name = _('Jurisdiction')
         verbose_name_plural = _('Jurisdiction')
+        indexes = [
+            models.Index(fields=('country', 'state', 'city',)),
+        ]
 
     def __str__(self):
         return self.agency or ''
@@ -180,6 +183,9 @@ class FirmLocation(BaseModel):
     class Meta:
         verbose_name = _('FirmLocation')
         verbose_name_plural = _('FirmLocation')
+        indexes = [
+            models.Index(fields=('country', 'state', 'city',)),
+        ]
 
     def __str__(self):
         return self.address
@@ -1,8 +1,8 @@
-import uuid as uuid
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel
+from libs.utils import uuid7
 from ..models import querysets
 # from .clients import AbstractClient
 from .users import AppUser
@@ -73,14 +73,14 @@ class Invite(BaseModel):
     CLIENT_TYPE_CLIENT = 'client'
     CLIENT_TYPE_LEAD = 'lead'
     CLIENT_TYPE_MEDIATOR = 'mediator'
-    TYPES = (
+    CLIENT_TYPES = (
         (CLIENT_TYPE_CLIENT, _('client')),
         (CLIENT_TYPE_LEAD, _('lead')),
         (CLIENT_TYPE_MEDIATOR, _('mediator')),
     )
     client_type = models.CharField(
         max_length=50,
-        choices=TYPES,
+        choices=CLIENT_TYPES,
         null=True,
         blank=True,
         verbose_name=_('Type of invitee'),
@@ -89,7 +89,7 @@ class Invite(BaseModel):
     uuid = models.UUIDField(
         primary_key=True,
         #editable=False,
-        default=uuid.uuid4,
+        default=uuid7,
         verbose_name=_('UUID'),
         help_text=_(
             'Primary key of invitation, used to make unique invitation link'
@@ -300,6 +300,14 @@ class Invite(BaseModel):
                 name='email_inviter_unique'
             )
         ]
+        indexes = [
+            # отложенные приглашения адвоката
+            models.Index(
+                fields=['inviter', 'user_type'],
+                condition=models.Q(user__isnull=True),
+                name='invite_pending_inviter_idx',
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -318,9 +326,14 @@ class Invite(BaseModel):
 
     def clean_email(self):
         """ Убедитесь, что пользователь с электронной почтой, указанной в приглашении, 
-        не существует. """
-        user_in_db = AppUser.objects.filter(email__iexact=self.email).first()
-        if not self.user and user_in_db:
+        не существует. Тип пользователя вычисляется только для ошибки.
+        """
+        if self.user_id:
+            return
+        user_in_db = AppUser.objects.filter(
+            email=self.email.lower()
+        ).only('pk').first()
+        if user_in_db:
             raise ValidationError(
                 'User with such email is already registered',
                 params={
@@ -342,5 +355,5 @@ class Invite(BaseModel):
         return cls.objects.filter(
             inviter=mediator.user,
             user__isnull=True,
-            user_type__in=[cls.USER_TYPE_MEDIATOR, cls.USER_TYPE_MEDIATOR]
+            user_type=cls.USER_TYPE_MEDIATOR
         )
@@ -39,19 +39,31 @@ class AppUserManager(BaseUserManager.from_queryset(AppUserQuerySet)):
             Был приглашен адвокатом
 
         """
-        mediator_matter_filter = Q(client__matters__mediator_id=user.pk)
-        mediator_client_lead_filter = Q(client__leads__mediator_id=user.pk)
-        mediator_invite_filter = Q(invitations__inviter_id=user.pk)
-
-        client_matter_filter = Q(mediator__matters__client_id=user.pk)
-        client_client_lead_filter = Q(mediator__leads__client_id=user.pk)
-        client_invite_filter = Q(sent_invitations__user_id=user.pk)
+        from ...business.models import Lead, Matter
+        from .invites import Invite
 
+        # Каждое условие - подзапрос по одной таблице без соединений, поэтому
+        # дубликатов нет и `distinct()` не нужен. Первичные ключи клиента и
+        # адвоката совпадают с id пользователя.
         return self.filter(
-            mediator_matter_filter |
-            mediator_client_lead_filter |
-            mediator_invite_filter |
-            client_matter_filter |
-            client_client_lead_filter |
-            client_invite_filter
-        ).distinct()
+            # для адвоката
+            Q(pk__in=Matter.objects.filter(
+                mediator_id=user.pk
+            ).values('client_id')) |
+            Q(pk__in=Lead.objects.filter(
+                mediator_id=user.pk
+            ).values('client_id')) |
+            Q(pk__in=Invite.objects.filter(
+                inviter_id=user.pk
+            ).values('user_id')) |
+            # для клиента
+            Q(pk__in=Matter.objects.filter(
+                client_id=user.pk
+            ).values('mediator_id')) |
+            Q(pk__in=Lead.objects.filter(
+                client_id=user.pk
+            ).values('mediator_id')) |
+            Q(pk__in=Invite.objects.filter(
+                user_id=user.pk
+            ).values('inviter_id'))
+        )
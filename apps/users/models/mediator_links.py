@@ -1,4 +1,3 @@
-import os
 import uuid
 from django.db import models
 from django.db.models import QuerySet
@@ -61,12 +60,15 @@ class UniversityQuerySet(QuerySet):
     def verified_universities(self):
         """ Получите все проверенные университеты. Проверенный университет - это университет, 
         в котором учился хотя бы один проверенный адвокат.
+        Проверяется подзапросом EXISTS, поэтому строки не дублируются и
+        `distinct()` не нужен.
         """
-        filter_params = {
-            'mediator_education__mediator__verification_status':
-                Mediator.VERIFICATION_APPROVED
-        }
-        return self.filter(**filter_params).distinct()
+        return self.filter(models.Exists(
+            MediatorEducation.objects.filter(
+                university=models.OuterRef('pk'),
+                mediator__verification_status=Mediator.VERIFICATION_APPROVED
+            )
+        ))
 
 
 class MediatorUniversity(BaseModel):
@@ -121,15 +123,11 @@ class MediatorRegistrationAttachment(BaseModel):
     def attachment_file_name(self):
         """Get attachment's file name."""
         if self.attachment:
-            return os.path.basename(self.attachment)
+            return self.attachment.rsplit('/', 1)[-1]
         return ""
+
     def __str__(self):
-        if self.attachment:
-            return (
-                f"Mediator {self.mediator.display_name}'s "
-                f'attachment: {self.attachment_file_name}'
-            )
         return (
-                f"Mediator {self.mediator.display_name}'s "
-                f'attachment: null'
+            f"Mediator {self.mediator.display_name}'s "
+            f"attachment: {self.attachment_file_name or 'null'}"
         )
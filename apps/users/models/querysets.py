@@ -4,8 +4,13 @@ from datetime import datetime
 from django.conf import settings
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
 from django.db import models
-from django.db.models import Count, Q, Sum
+from django.db.models import Count, F, Q, Sum
 from ...finance.models.payments.querysets import AbstractPaidObjectQuerySet
 from .utils.verification import VerifiedRegistrationQuerySet
 
@@ -38,6 +43,21 @@ class InviteQuerySet(models.QuerySet):
         from . import Invite
         return self.filter(type=Invite.TYPE_INVITED)
 
+    def optimized(self):
+        """ Присоедините пользователей и местоположение приглашений.
+        Они выводятся сериализатором приглашений, поэтому загружаются одним
+        запросом, а не отдельным запросом для каждого приглашения.
+        """
+        return self.select_related(
+            'inviter',
+            'user',
+            'country',
+            'state',
+            'city',
+            'city__region',
+            'city__country',
+        )
+
 
 class AppUserQuerySet(models.QuerySet):
     """Queryset class for `AppUser` model."""
@@ -103,10 +123,36 @@ class AppUserQuerySet(models.QuerySet):
 
     def is_registered(self, email):
         """ Проверьте электронную почту, если она уже существует """
-        return self.filter(email__iexact=email).exists()
+        return self.filter(email=email.lower()).exists()
+
+    def update_search_vector(self):
+        """ Обновите поисковый вектор пользователей по имени и email.
+        Используется конфигурация `simple`, чтобы имена не отбрасывались как
+        стоп-слова и не приводились к основе.
+        """
+        return self.update(search_vector=SearchVector(
+            'first_name', 'last_name', 'email', config='simple'
+        ))
+
+
+class UserSearchQuerySet(VerifiedRegistrationQuerySet):
+    """Queryset class for profiles which are searched by user's name."""
+
+    def search(self, query: str):
+        """ Полнотекстовый поиск по имени и email пользователя.
+
+        Используется сохраненный вектор `AppUser.search_vector` с GIN
+        индексом. Email в векторе - одно слово, поэтому находится только по
+        полному адресу. Результаты сортируются по `featured` и
+        релевантности.
+        """
+        search_query = SearchQuery(query, config='simple')
+        return self.filter(user__search_vector=search_query).annotate(
+            rank=SearchRank(F('user__search_vector'), search_query),
+        ).order_by('-featured', '-rank')
 
 
-class MediatorQuerySet(VerifiedRegistrationQuerySet):
+class MediatorQuerySet(UserSearchQuerySet):
     """Queryset class for `Mediator` model."""
 
     def with_distance(
@@ -115,17 +161,22 @@ class MediatorQuerySet(VerifiedRegistrationQuerySet):
         latitude: typing.Union[int, float, str],
     ):
         """ Добавьте аннотацию расстояния в набор запросов помощника юриста.
-        Если отправлены неверные координаты, метод аннотирует набор запросов с помощью
-        расстояние = null. Мы не можем просто вернуть queryset(self), потому что мы
+        Если координаты не отправлены или неверны, метод аннотирует набор
+        запросов константой расстояние = null без вычислений PostGIS.
+        Мы не можем просто вернуть queryset(self), потому что мы
         позже в api используйте "distance" для заказа помощников юриста.
         """
-        try:
-            point = Point(
-                x=float(longitude),
-                y=float(latitude),
-                srid=settings.LOCATION_SRID,
-            )
-        except (TypeError, ValueError) as error:
+        point = None
+        if longitude is not None and latitude is not None:
+            try:
+                point = Point(
+                    x=float(longitude),
+                    y=float(latitude),
+                    srid=settings.LOCATION_SRID,
+                )
+            except (TypeError, ValueError):
+                pass
+        if point is None:
             return self.annotate(
                 distance=models.Value(None, output_field=models.FloatField())
             )
@@ -133,6 +184,14 @@ class MediatorQuerySet(VerifiedRegistrationQuerySet):
             distance=Distance('firm_location', point)
         )
 
+    def lightweight(self):
+        """ Отложите загрузку больших текстовых полей адвоката.
+        Используется для списков и профиля, которые не выводят информацию
+        о лицензии; `extra_info` и `charity_organizations` выводятся
+        сериализатором списка, поэтому загружаются сразу.
+        """
+        return self.defer('license_info')
+
     def has_lead_with_user(self, user):
         """ Отфильтруйте адвокатов, с которыми у клиента есть контакты.
         Если пользователь является клиентом, мы фильтруем набор запросов, чтобы вернуть 
@@ -167,7 +226,7 @@ class MediatorQuerySet(VerifiedRegistrationQuerySet):
             total_count=Count('pk', ),
         )
 
-class EnterpriseQuerySet(VerifiedRegistrationQuerySet):
+class EnterpriseQuerySet(UserSearchQuerySet):
     """Queryset class for `Enterprise` model."""
 
     def real_users(self):
@@ -255,6 +314,31 @@ class ClientQuerySet(models.QuerySet):
             matter_filter | shared_matter_filter | lead_filter | invite_filter
         ).distinct()
 
+    def with_favorite_mediators(self, queryset=None):
+        """ Загрузите избранных адвокатов клиентов одним запросом.
+        `queryset` позволяет загрузить связи адвокатов, которые выводятся
+        вместе с ними. Адвокаты не фильтруются по видимости.
+        """
+        return self.prefetch_related(
+            models.Prefetch('favorite_mediators', queryset=queryset)
+        )
+
+    def for_api(self):
+        """ Загрузите связи, которые выводятся в профиле клиента.
+        Дела загружаются для подсчета `matters_count` без отдельных запросов.
+        """
+        return self.select_related(
+            'user',
+            'user__timezone',
+            'country',
+            'state',
+            'city',
+            'city__region',
+        ).prefetch_related(
+            'user__specialities',
+            'matters',
+        )
+
 
 class SupportQuerySet(
     AbstractPaidObjectQuerySet, VerifiedRegistrationQuerySet
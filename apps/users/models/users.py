@@ -2,6 +2,8 @@ import uuid
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
@@ -56,6 +58,8 @@ class AppUser(BaseModel, AbstractBaseUser, PermissionsMixin):
                 помощь
         twofa (boolean): флаг для двухфакторной аутентификации
         timezone (TimeZone): внешний ключ к часовому поясу
+        search_vector (SearchVector): поисковый вектор по имени и email,
+            обновляется сигналом после сохранения пользователя
     """
     # различные возможные типы пользователей в приложении
     USER_TYPE_MEDIATOR = 'mediator'
@@ -189,6 +193,12 @@ class AppUser(BaseModel, AbstractBaseUser, PermissionsMixin):
         default=False,
     )
 
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=_('Search vector'),
+    )
+
     objects = AppUserManager()
 
     # таким образом, аутентификация происходит по электронной почте вместо имени пользователя
@@ -201,12 +211,27 @@ class AppUser(BaseModel, AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = _('AppUser')
         verbose_name_plural = _('AppUsers')
+        indexes = [
+            GinIndex(
+                fields=('search_vector',),
+                name='appuser_search_vector_idx',
+            ),
+        ]
 
     def __str__(self):
         if self.full_name:
             return self.full_name
         return self.email
 
+    def save(self, *args, **kwargs):
+        """ Храните электронную почту в нижнем регистре, чтобы поиск по ней 
+        использовал уникальный индекс. Существующие адреса приводятся
+        командой `lowercase_emails`.
+        """
+        if self.email:
+            self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
     @property
     def avatar_url(self):
         """ Верните аватар пользователя """
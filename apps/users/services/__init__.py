@@ -1,13 +1,17 @@
 from .statistics import (
     create_stat,
+    get_cached_mediator_statistics,
     get_mediator_period_statistic,
     get_mediator_statistics,
     get_stats_for_dashboard,
     get_stats_for_time_period_by_tag,
+    invalidate_mediator_statistics,
 )
 #from .support import get_or_create_support_fee_payment
 
 __all__ = (
+    'get_cached_mediator_statistics',
+    'invalidate_mediator_statistics',
     'get_mediator_statistics',
     'get_mediator_period_statistic',
     'get_stats_for_time_period_by_tag',
@@ -1,7 +1,10 @@
+import hashlib
+import time
 from datetime import datetime
 from functools import partial
 
 import arrow
+from django.core.cache import cache
 
 from ...business import services as business_services
 from ...documents import services as documents_services
@@ -9,6 +12,8 @@ from ...forums import services as forums_services
 from ...users import models
 
 __all__ = (
+    'get_cached_mediator_statistics',
+    'invalidate_mediator_statistics',
     'get_mediator_statistics',
     'get_mediator_period_statistic',
     'get_stats_for_time_period_by_tag',
@@ -16,6 +21,50 @@ __all__ = (
     'create_stat',
 )
 
+STATISTICS_CACHE_KEY = 'mediator-statistics:{pk}:{version}:{name}:{params}'
+STATISTICS_CACHE_VERSION_KEY = 'mediator-statistics-version:{pk}'
+# статистика опрашивается панелью управления, поэтому небольшая задержка
+# допустима для изменений, которые не сбрасывают кэш сигналами
+STATISTICS_CACHE_TIMEOUT = 120
+
+
+def invalidate_mediator_statistics(mediator_id: int):
+    """Drop cached statistics of mediator by changing its cache version."""
+    cache.set(
+        STATISTICS_CACHE_VERSION_KEY.format(pk=mediator_id),
+        time.time(),
+        timeout=STATISTICS_CACHE_TIMEOUT
+    )
+
+
+def get_cached_mediator_statistics(
+    mediator: models.Mediator,
+    name: str,
+    getter,
+    **params
+) -> dict:
+    """Get mediator statistics from cache or calculate them with `getter`.
+
+    Statistics are cached per mediator, statistics `name` and `params`.
+
+    """
+    version = cache.get(
+        STATISTICS_CACHE_VERSION_KEY.format(pk=mediator.pk), 0
+    )
+    cache_key = STATISTICS_CACHE_KEY.format(
+        pk=mediator.pk,
+        version=version,
+        name=name,
+        params=hashlib.md5(
+            repr(sorted(params.items())).encode()
+        ).hexdigest(),
+    )
+    statistics = cache.get(cache_key)
+    if statistics is None:
+        statistics = getter(mediator, **params)
+        cache.set(cache_key, statistics, STATISTICS_CACHE_TIMEOUT)
+    return statistics
+
 
 def get_mediator_statistics(mediator: models.Mediator) -> dict:
     """Get mediator statistics from all apps.
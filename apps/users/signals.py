@@ -3,10 +3,15 @@ import typing
 from typing import Union
 from django.db.models import signals
 from django.dispatch import Signal, receiver
-from ..business.models import Stage
+from libs.api.views.mixins import (
+    invalidate_list_cache,
+    invalidate_object_cache,
+)
+from ..business.models import Lead, Matter, Opportunity, Stage
 from ..documents.models import Folder
 from ..notifications.models import NotificationSetting
 from ..users import models, utils
+from ..users.services import invalidate_mediator_statistics
 
 
 new_opportunities_for_mediator = Signal(providing_args=('instance',))
@@ -115,6 +120,20 @@ def set_link_to_user_in_invites(instance: models.AppUser, created, **kwargs):
     ).update(user=instance)
 
 
+@receiver(signals.post_save, sender=models.AppUser)
+def update_user_search_vector(
+    instance: models.AppUser, update_fields=None, **kwargs
+):
+    """ Обновите поисковый вектор пользователя после сохранения.
+    Пропускается, если сохранялись только поля, не входящие в вектор
+    (например, `last_login` при входе).
+    """
+    vector_fields = {'first_name', 'last_name', 'email'}
+    if update_fields is not None and not vector_fields & set(update_fields):
+        return
+    models.AppUser.objects.filter(pk=instance.pk).update_search_vector()
+
+
 @receiver(signals.post_save, sender=models.Client)
 def inform_inviter_about_user(instance: models.Client, created, **kwargs):
     """ Сообщите адвокату, что пользователь зарегистрирован. """
@@ -123,7 +142,7 @@ def inform_inviter_about_user(instance: models.Client, created, **kwargs):
 
     invites = models.Invite.objects.filter(
         email__iexact=instance.email
-    )
+    ).optimized()
     for invite in invites:
         utils.inform_inviter(invite=invite)
 
@@ -201,3 +220,121 @@ def enable_new_contact_notifications(
                 instance=instance,
                 receiver_pks=kwargs.get('pk_set')
             )
+
+
+@receiver(signals.post_save, sender=models.FeeKind)
+@receiver(signals.post_delete, sender=models.FeeKind)
+@receiver(signals.post_save, sender=models.Currencies)
+@receiver(signals.post_delete, sender=models.Currencies)
+@receiver(signals.post_save, sender=models.FirmSize)
+@receiver(signals.post_delete, sender=models.FirmSize)
+@receiver(signals.post_save, sender=models.TimeZone)
+@receiver(signals.post_delete, sender=models.TimeZone)
+@receiver(signals.post_save, sender=models.Language)
+@receiver(signals.post_delete, sender=models.Language)
+@receiver(signals.post_save, sender=models.AppointmentType)
+@receiver(signals.post_delete, sender=models.AppointmentType)
+@receiver(signals.post_save, sender=models.PaymentType)
+@receiver(signals.post_delete, sender=models.PaymentType)
+@receiver(signals.post_save, sender=models.MediatorUniversity)
+@receiver(signals.post_delete, sender=models.MediatorUniversity)
+def invalidate_reference_data_cache(sender, **kwargs):
+    """ Сбросьте кэш списков справочных данных при их изменении. """
+    invalidate_list_cache(sender)
+
+
+@receiver(signals.post_save, sender=models.MediatorEducation)
+@receiver(signals.post_delete, sender=models.MediatorEducation)
+@receiver(signals.post_save, sender=models.Mediator)
+def invalidate_verified_universities_cache(**kwargs):
+    """ Сбросьте кэш списка университетов при изменении образования или
+    проверки адвоката: в списке только университеты проверенных адвокатов.
+    """
+    invalidate_list_cache(models.MediatorUniversity)
+
+
+@receiver(signals.post_save, sender=models.Mediator)
+@receiver(signals.post_delete, sender=models.Mediator)
+@receiver(signals.post_save, sender=models.AppUser)
+def invalidate_mediator_cache(
+    instance: Union[models.Mediator, models.AppUser],
+    **kwargs
+):
+    """ Сбросьте кэш профиля адвоката при изменении адвоката или пользователя.
+    Первичный ключ адвоката совпадает с первичным ключом пользователя.
+    """
+    invalidate_object_cache(models.Mediator, instance.pk)
+
+
+@receiver(signals.post_save, sender=models.Enterprise)
+@receiver(signals.post_save, sender=models.MediatorEducation)
+@receiver(signals.post_delete, sender=models.MediatorEducation)
+@receiver(signals.post_save, sender=models.MediatorRegistrationAttachment)
+@receiver(signals.post_delete, sender=models.MediatorRegistrationAttachment)
+def invalidate_related_mediator_cache(
+    instance: Union[
+        models.Enterprise,
+        models.MediatorEducation,
+        models.MediatorRegistrationAttachment,
+    ],
+    **kwargs
+):
+    """ Сбросьте кэш профиля адвоката при изменении связанного объекта. """
+    if isinstance(instance, models.Enterprise):
+        invalidate_object_cache(models.Mediator, instance.user_id)
+    else:
+        invalidate_object_cache(models.Mediator, instance.mediator_id)
+
+
+@receiver(signals.post_save, sender=models.FirmLocation)
+@receiver(signals.post_save, sender=models.Jurisdiction)
+def invalidate_location_mediators_cache(
+    instance: Union[models.FirmLocation, models.Jurisdiction],
+    **kwargs
+):
+    """ Сбросьте кэш профилей адвокатов с измененным местоположением. """
+    for pk in instance.mediators.values_list('pk', flat=True):
+        invalidate_object_cache(models.Mediator, pk)
+
+
+@receiver(signals.m2m_changed, sender=models.Mediator.followers.through)
+@receiver(signals.m2m_changed, sender=models.Mediator.firm_locations.through)
+@receiver(
+    signals.m2m_changed, sender=models.Mediator.practice_jurisdictions.through
+)
+@receiver(signals.m2m_changed, sender=models.Mediator.fee_types.through)
+@receiver(signals.m2m_changed, sender=models.Mediator.appointment_type.through)
+@receiver(signals.m2m_changed, sender=models.Mediator.payment_type.through)
+@receiver(signals.m2m_changed, sender=models.Mediator.spoken_language.through)
+@receiver(signals.m2m_changed, sender=models.AppUser.specialities.through)
+def invalidate_mediator_relations_cache(instance, action, reverse, pk_set,
+                                        **kwargs):
+    """ Сбросьте кэш профилей адвокатов при изменении их связей.
+    При обратном изменении `pk_set` содержит первичные ключи адвокатов
+    (или пользователей для специальностей).
+    """
+    if not action.startswith('post_'):
+        return
+    pks = (pk_set or ()) if reverse else (instance.pk,)
+    for pk in pks:
+        invalidate_object_cache(models.Mediator, pk)
+
+
+@receiver(signals.post_save, sender=Lead)
+@receiver(signals.post_delete, sender=Lead)
+@receiver(signals.post_save, sender=Matter)
+@receiver(signals.post_delete, sender=Matter)
+@receiver(signals.post_save, sender=Opportunity)
+@receiver(signals.post_delete, sender=Opportunity)
+@receiver(signals.post_save, sender=models.UserStatistic)
+def invalidate_mediator_statistics_cache(
+    instance: Union[Lead, Matter, Opportunity, models.UserStatistic],
+    **kwargs
+):
+    """ Сбросьте кэш статистики адвоката при изменении его данных.
+    Первичный ключ адвоката совпадает с первичным ключом пользователя.
+    """
+    if isinstance(instance, models.UserStatistic):
+        invalidate_mediator_statistics(instance.user_id)
+    elif instance.mediator_id is not None:
+        invalidate_mediator_statistics(instance.mediator_id)
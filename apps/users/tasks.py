@@ -0,0 +1,35 @@
+from allauth.account.models import EmailAddress
+
+from config.celery import app
+
+from . import notifications
+from .models import AppUser, Enterprise, Member
+
+
+@app.task()
+def send_email_confirmation_task(user_id: int, signup: bool = False):
+    """ Отправьте пользователю письмо со ссылкой для подтверждения 
+    электронной почты вне цикла запроса.
+    """
+    user = AppUser.objects.get(id=user_id)
+    email_address = EmailAddress.objects.get_for_user(user, user.email)
+    email_address.send_confirmation(None, signup=signup)
+
+
+@app.task()
+def send_register_user_notification_task(user_id: int):
+    """ Уведомите администраторов о новом зарегистрированном пользователе. """
+    user = AppUser.objects.get(id=user_id)
+    notifications.RegisterUserNotification(user).send()
+
+
+@app.task()
+def send_enterprise_invitations_task(enterprise_id: int, invitations: list):
+    """ Отправьте приглашения новым членам enterprise.
+
+    `invitations` - список пар (id участника, тип участника).
+    """
+    enterprise = Enterprise.objects.get(pk=enterprise_id)
+    types = dict(invitations)
+    for member in Member.objects.filter(pk__in=types):
+        member._send_invitation(enterprise, types[member.pk])
@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from apps.business.factories import LeadFactory, MatterFactory
+from apps.business.models import Lead
+
+from ..factories import ClientFactory, MinimalMediatorFactory
+from ..models import Client
+
+
+class TestMediatorClientsAndLeads(TestCase):
+    """Tests for ``Client.mediator_clients_and_leads`` method."""
+
+    def setUp(self):
+        self.mediator = MinimalMediatorFactory()
+
+        # client with several matters would be duplicated by a join
+        self.matters_client = ClientFactory()
+        matter = MatterFactory(
+            mediator=self.mediator, client=self.matters_client
+        )
+        MatterFactory(
+            mediator=self.mediator,
+            client=self.matters_client,
+            lead=matter.lead,
+        )
+
+        self.lead_client = LeadFactory(
+            mediator=self.mediator, topic=None
+        ).client
+        self.converted_client = LeadFactory(
+            mediator=self.mediator, topic=None, status=Lead.STATUS_CONVERTED
+        ).client
+
+        # contacts of other mediators aren't returned
+        LeadFactory(mediator=MinimalMediatorFactory(), topic=None)
+
+        self.queryset = Client.mediator_clients_and_leads(self.mediator)
+
+    def test_no_duplicates(self):
+        """Each client is returned once without ``distinct()``."""
+        pks = list(self.queryset.values_list('pk', flat=True))
+        self.assertEqual(len(list(self.queryset)), len(set(pks)))
+        self.assertEqual(set(pks), {
+            self.matters_client.pk,
+            self.lead_client.pk,
+            self.converted_client.pk,
+        })
+
+    def test_annotations(self):
+        """``has_matters`` and ``is_converted`` describe mediator contacts."""
+        contacts = {contact.pk: contact for contact in self.queryset}
+        self.assertTrue(contacts[self.matters_client.pk].has_matters)
+        self.assertFalse(contacts[self.lead_client.pk].has_matters)
+        self.assertFalse(contacts[self.lead_client.pk].is_converted)
+        self.assertTrue(contacts[self.converted_client.pk].is_converted)
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from django.utils import timezone
 from ..users import models, notifications
 
@@ -7,7 +8,19 @@ def send_invitation(invite: models.Invite):
     """ Отправьте клиенту электронное письмо с приглашением. """
     notifications.InviteNotification(invite=invite).send()
     invite.sent = timezone.now()
-    invite.save()
+    invite.save(update_fields=('sent', 'modified'))
+
+
+def send_invitations(invites):
+    """ Отправьте письма с приглашениями и отметьте их одним запросом. """
+    for invite in invites:
+        notifications.InviteNotification(invite=invite).send()
+    sent = timezone.now()
+    models.Invite.objects.filter(
+        pk__in=[invite.pk for invite in invites]
+    ).update(sent=sent, modified=sent)
+    for invite in invites:
+        invite.sent = sent
 
 
 def inform_inviter(invite: models.Invite):
@@ -15,6 +28,7 @@ def inform_inviter(invite: models.Invite):
     notifications.RegisteredClientNotification(invite=invite).send()
 
 
+@lru_cache(maxsize=4096)
 def format_phone_for_twillio(phone):
     """format phone e.g 1(954) 770-4860 -> +19547704860 """
     if phone:
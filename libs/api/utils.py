@@ -0,0 +1,192 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+from rest_framework import serializers
+
+__all__ = ('get_related_lookups', 'get_serializer_columns', 'optimize_queryset')
+
+
+def _get_nested_serializer(field):
+    """Return serializer used to render `field` if it is nested one."""
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def _is_pk_only(field):
+    """Check if related `field` renders only primary key of relation."""
+    return isinstance(field, serializers.RelatedField) and \
+        field.use_pk_only_optimization()
+
+
+def _merge_lookups(lookups, other):
+    """Merge `other` select and prefetch lookups into `lookups`."""
+    select_related, prefetch_related = lookups
+    other_select_related, other_prefetch_related = other
+    select_related |= other_select_related
+    for path, (model, nested) in other_prefetch_related.items():
+        if path in prefetch_related:
+            _merge_lookups(prefetch_related[path][1], nested)
+        else:
+            prefetch_related[path] = (model, nested)
+
+
+def _collect_lookups(serializer, model, prefix=''):
+    """Collect relations of `model` rendered by `serializer` fields.
+
+    Returns tuple of `select_related` lookups set and dict of
+    `prefetch_related` lookups, where each lookup is mapped to its related
+    model and lookups of nested serializer.
+
+    """
+    lookups = (set(), {})
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        nested = _get_nested_serializer(field)
+        source_attrs = field.source_attrs
+        if not source_attrs:
+            # source='*', serializer renders the same instance
+            if nested is not None:
+                _merge_lookups(lookups, _collect_lookups(nested, model, prefix))
+            continue
+
+        path = []
+        related_model = model
+        many = False
+        for attr in source_attrs:
+            try:
+                model_field = related_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation or \
+                    model_field.related_model is None:
+                break
+            path.append(attr)
+            related_model = model_field.related_model
+            if model_field.many_to_many or model_field.one_to_many:
+                many = True
+                break
+        if not path:
+            continue
+
+        resolved = len(path) == len(source_attrs)
+        if resolved and not many and model_field.concrete and \
+                _is_pk_only(field):
+            # primary key is read from foreign key column, so only relations
+            # before the last one should be joined
+            if len(path) > 1:
+                lookups[0].add(prefix + '__'.join(path[:-1]))
+            continue
+
+        nested_lookups = (set(), {})
+        if nested is not None and resolved:
+            nested_lookups = _collect_lookups(nested, related_model)
+
+        if many:
+            if len(path) > 1:
+                lookups[0].add(prefix + '__'.join(path[:-1]))
+            _merge_lookups(lookups, (set(), {
+                prefix + '__'.join(path): (related_model, nested_lookups)
+            }))
+            continue
+
+        lookup = prefix + '__'.join(path)
+        lookups[0].add(lookup)
+        nested_select, nested_prefetch = nested_lookups
+        _merge_lookups(lookups, (
+            {f'{lookup}__{select}' for select in nested_select},
+            {
+                f'{lookup}__{path}': value
+                for path, value in nested_prefetch.items()
+            },
+        ))
+    return lookups
+
+
+@lru_cache(maxsize=None)
+def get_related_lookups(serializer_class, model):
+    """Get relations of `model` rendered by `serializer_class`.
+
+    Result is cached per serializer class, since serializer declaration
+    doesn't change at runtime.
+
+    """
+    return _collect_lookups(serializer_class(), model)
+
+
+def _build_prefetch(lookup, model, lookups):
+    """Build `Prefetch` object which joins nested relations to its query."""
+    select_related, prefetch_related = lookups
+    if not select_related and not prefetch_related:
+        return lookup
+    queryset = model._default_manager.select_related(
+        *sorted(select_related)
+    ).prefetch_related(*[
+        _build_prefetch(path, related_model, nested)
+        for path, (related_model, nested) in sorted(prefetch_related.items())
+    ])
+    return Prefetch(lookup, queryset=queryset)
+
+
+def optimize_queryset(queryset, serializer_class, extra_lookups=()):
+    """Select and prefetch relations, rendered by `serializer_class`.
+
+    Relations are resolved by walking `source` of serializer fields
+    (including nested serializers): forward foreign keys and one to one
+    relations are added to `select_related`, many to many and reverse
+    foreign keys are prefetched. Relations used by `SerializerMethodField`
+    can't be detected, so they should be passed in `extra_lookups`, which
+    take precedence over detected lookups with the same path.
+
+    Example:
+        optimize_queryset(
+            Enterprise.objects.all(),
+            EnterpriseSerializer,
+            extra_lookups=('team_members_invited',)
+        )
+
+    """
+    select_related, prefetch_related = get_related_lookups(
+        serializer_class, queryset.model
+    )
+    prefetches = {
+        path: _build_prefetch(path, related_model, nested)
+        for path, (related_model, nested) in prefetch_related.items()
+    }
+    for lookup in extra_lookups:
+        path = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        prefetches[path] = lookup
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    return queryset.prefetch_related(*[
+        prefetches[path] for path in sorted(prefetches)
+    ])
+
+
+@lru_cache(maxsize=None)
+def get_serializer_columns(serializer_class, model):
+    """Get names of `model` columns rendered by `serializer_class`.
+
+    Returns `None` if some field is rendered from something other than a
+    model field (method fields, properties, `source='*'`), since its
+    columns can't be detected.
+
+    """
+    columns = {model._meta.pk.name}
+    for field in serializer_class().fields.values():
+        if field.write_only:
+            continue
+        if not field.source_attrs:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            columns.add(model_field.name)
+    return tuple(sorted(columns))
@@ -1,3 +1,16 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..utils import get_serializer_columns, optimize_queryset
+
+
 class ActionPermissionsMixin(object):
     """ Mixin, который позволяет определять конкретные разрешения для каждого действия
     Для этого требуется заполненный атрибут `permissions_map`
@@ -96,3 +109,177 @@ class ActionSerializerMixin(object):
             return self.serializers_map.get('default')
 
         return serializer_class
+
+
+class AutoPrefetchMixin(object):
+    """ Mixin, который выбирает и предварительно загружает связи, используемые
+    сериализатором текущего действия.
+
+    Связи, которые используются в `SerializerMethodField`, нельзя определить
+    автоматически, поэтому их нужно указать в `extra_related_lookups`.
+
+    Примеры:
+        class EnterpriseViewSet(AutoPrefetchMixin, viewsets.ModelViewSet):
+            queryset = Enterprise.objects.all()
+            serializer_class = EnterpriseSerializer
+            extra_related_lookups = (
+                'team_members_invited',
+            )
+    """
+    extra_related_lookups = ()
+
+    def get_queryset(self):
+        """ Добавьте связи сериализатора в набор запросов. """
+        return optimize_queryset(
+            super().get_queryset(),
+            self.get_serializer_class(),
+            extra_lookups=self.extra_related_lookups,
+        )
+
+
+class OnlySerializerFieldsMixin(object):
+    """ Mixin, который загружает из БД только колонки, используемые
+    сериализатором, для действий чтения.
+
+    Если колонки сериализатора нельзя определить (например, есть
+    `SerializerMethodField`), набор запросов не меняется.
+
+    Примеры:
+        class FeeKindViewSet(OnlySerializerFieldsMixin, viewsets.ModelViewSet):
+            queryset = FeeKind.objects.all()
+            serializer_class = FeeKindSerializer
+    """
+    only_fields_actions = ('list', 'retrieve')
+
+    def get_queryset(self):
+        """ Ограничьте колонки набора запросов полями сериализатора. """
+        qs = super().get_queryset()
+        if self.action not in self.only_fields_actions:
+            return qs
+        columns = get_serializer_columns(
+            self.get_serializer_class(), qs.model
+        )
+        if columns is None:
+            return qs
+        return qs.only(*columns)
+
+
+LIST_CACHE_VERSION_KEY = 'cached-list-version:{model}'
+
+
+def get_list_cache_version(model):
+    """ Получите текущую версию кэша списков для модели. """
+    return cache.get(
+        LIST_CACHE_VERSION_KEY.format(model=model._meta.label_lower), 0
+    )
+
+
+def invalidate_list_cache(model):
+    """ Сбросьте кэшированные списки модели, изменив версию их кэша. """
+    cache.set(
+        LIST_CACHE_VERSION_KEY.format(model=model._meta.label_lower),
+        time.time(),
+        timeout=None
+    )
+
+
+def get_etag(data):
+    """ Получите `ETag` для сериализованных данных ответа. """
+    return '"{}"'.format(hashlib.md5(
+        json.dumps(data, cls=DjangoJSONEncoder).encode()
+    ).hexdigest())
+
+
+def cached_response(request, data, etag):
+    """ Верните кэшированные данные или `304`, если `ETag` совпадает. """
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        return Response(
+            status=status.HTTP_304_NOT_MODIFIED,
+            headers={'ETag': etag}
+        )
+    return Response(data, headers={'ETag': etag})
+
+
+class CachedListMixin(object):
+    """ Mixin, который кэширует ответ действия `list` и добавляет к нему `ETag`.
+
+    Подходит для редко изменяемых справочных данных. Кэш ключуется по
+    представлению и параметрам запроса, а сбрасывается через
+    `invalidate_list_cache` при изменении модели (см. сигналы приложения).
+    Если `If-None-Match` совпадает с `ETag`, возвращается `304`.
+    """
+    list_cache_timeout = 60 * 10
+
+    def get_list_cache_key(self, request):
+        """ Получите ключ кэша для текущего запроса. """
+        params = hashlib.md5(
+            request.query_params.urlencode().encode()
+        ).hexdigest()
+        version = get_list_cache_version(self.queryset.model)
+        return f'cached-list:{self.__class__.__name__}:{version}:{params}'
+
+    def list(self, request, *args, **kwargs):
+        """ Верните кэшированный список, если он есть. """
+        cache_key = self.get_list_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            data = super().list(request, *args, **kwargs).data
+            cached = (data, get_etag(data))
+            cache.set(cache_key, cached, self.list_cache_timeout)
+        return cached_response(request, *cached)
+
+
+OBJECT_CACHE_VERSION_KEY = 'cached-object-version:{model}:{pk}'
+# версия должна жить дольше кэшированных ответов объекта
+OBJECT_CACHE_VERSION_TIMEOUT = 60 * 60 * 24
+
+
+def get_object_cache_version(model, pk):
+    """ Получите текущую версию кэша объекта модели. """
+    return cache.get(
+        OBJECT_CACHE_VERSION_KEY.format(model=model._meta.label_lower, pk=pk),
+        0
+    )
+
+
+def invalidate_object_cache(model, pk):
+    """ Сбросьте кэшированные ответы объекта, изменив версию его кэша. """
+    cache.set(
+        OBJECT_CACHE_VERSION_KEY.format(model=model._meta.label_lower, pk=pk),
+        time.time(),
+        timeout=OBJECT_CACHE_VERSION_TIMEOUT
+    )
+
+
+class CachedRetrieveMixin(object):
+    """ Mixin, который кэширует ответ действия `retrieve` и добавляет `ETag`.
+
+    Кэш ключуется по представлению, первичному ключу объекта, текущему
+    пользователю и параметрам запроса, так как сериализаторы могут
+    скрывать поля в зависимости от того, кто запрашивает объект. Кэш
+    сбрасывается через `invalidate_object_cache` при изменении объекта
+    (см. сигналы приложения). Изменения, которые не отслеживаются
+    сигналами, видны после истечения `retrieve_cache_timeout`.
+    """
+    retrieve_cache_timeout = 60
+
+    def get_retrieve_cache_key(self, request):
+        """ Получите ключ кэша для текущего запроса. """
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        params = hashlib.md5(
+            request.query_params.urlencode().encode()
+        ).hexdigest()
+        version = get_object_cache_version(self.queryset.model, pk)
+        user_pk = request.user.pk if request.user.is_authenticated else None
+        return f'cached-object:{self.__class__.__name__}:{pk}:' \
+            f'{version}:{user_pk}:{params}'
+
+    def retrieve(self, request, *args, **kwargs):
+        """ Верните кэшированный объект, если он есть. """
+        cache_key = self.get_retrieve_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            data = super().retrieve(request, *args, **kwargs).data
+            cached = (data, get_etag(data))
+            cache.set(cache_key, cached, self.retrieve_cache_timeout)
+        return cached_response(request, *cached)
@@ -0,0 +1,139 @@
+from django.db.models import Prefetch
+from django.test import TestCase
+
+from rest_framework import serializers
+
+from apps.users.models import AppUser, Client, FeeKind, Mediator
+
+from ...api.utils import get_serializer_columns, optimize_queryset
+
+
+class UserSerializer(serializers.ModelSerializer):
+    """Serializer which renders only user's own columns."""
+
+    class Meta:
+        model = AppUser
+        fields = ('id', 'email', 'first_name')
+
+
+class MediatorSerializer(serializers.ModelSerializer):
+    """Serializer which renders mediator with nested user."""
+    user = UserSerializer()
+
+    class Meta:
+        model = Mediator
+        fields = ('user',)
+
+
+class ClientSerializer(serializers.ModelSerializer):
+    """Serializer which renders all kinds of client relations."""
+    user = UserSerializer()
+    country = serializers.PrimaryKeyRelatedField(read_only=True)
+    state_name = serializers.CharField(source='state.name')
+    shared_with = UserSerializer(many=True)
+    favorite_mediators = MediatorSerializer(many=True)
+    note = serializers.CharField(write_only=True)
+
+    class Meta:
+        model = Client
+        fields = (
+            'user',
+            'country',
+            'state_name',
+            'shared_with',
+            'favorite_mediators',
+            'note',
+        )
+
+
+class FeeKindSerializer(serializers.ModelSerializer):
+    """Serializer which renders only model columns."""
+
+    class Meta:
+        model = FeeKind
+        fields = ('title',)
+
+
+class FeeKindMethodSerializer(serializers.ModelSerializer):
+    """Serializer with field which isn't backed by model column."""
+    label = serializers.SerializerMethodField()
+
+    class Meta:
+        model = FeeKind
+        fields = ('title', 'label')
+
+    def get_label(self, obj):
+        return obj.title
+
+
+class TestOptimizeQueryset(TestCase):
+    """Tests for ``optimize_queryset`` function."""
+
+    def setUp(self):
+        self.queryset = optimize_queryset(
+            Client.objects.all(), ClientSerializer
+        )
+
+    def get_prefetches(self, queryset):
+        """Map prefetch lookups of ``queryset`` by their paths."""
+        return {
+            getattr(lookup, 'prefetch_to', lookup): lookup
+            for lookup in queryset._prefetch_related_lookups
+        }
+
+    def test_select_related(self):
+        """Forward relations are joined, pk only relations are not.
+
+        ``country`` is rendered as primary key, which is read from the
+        foreign key column, so it shouldn't be joined.
+
+        """
+        self.assertEqual(
+            set(self.queryset.query.select_related), {'user', 'state'}
+        )
+
+    def test_prefetch_related(self):
+        """Many to many relations are prefetched.
+
+        Relations of nested serializer are joined to the prefetch query.
+
+        """
+        prefetches = self.get_prefetches(self.queryset)
+        self.assertEqual(
+            set(prefetches), {'shared_with', 'favorite_mediators'}
+        )
+        self.assertEqual(prefetches['shared_with'], 'shared_with')
+        mediators = prefetches['favorite_mediators']
+        self.assertIsInstance(mediators, Prefetch)
+        self.assertEqual(
+            set(mediators.queryset.query.select_related), {'user'}
+        )
+
+    def test_extra_lookups(self):
+        """Extra lookups replace detected lookups with the same path."""
+        extra = Prefetch('shared_with', queryset=AppUser.objects.only('pk'))
+        queryset = optimize_queryset(
+            Client.objects.all(),
+            ClientSerializer,
+            extra_lookups=(extra, 'matters'),
+        )
+        prefetches = self.get_prefetches(queryset)
+        self.assertIs(prefetches['shared_with'], extra)
+        self.assertEqual(prefetches['matters'], 'matters')
+
+
+class TestGetSerializerColumns(TestCase):
+    """Tests for ``get_serializer_columns`` function."""
+
+    def test_model_columns(self):
+        """Columns of serializer fields are returned with primary key."""
+        self.assertEqual(
+            get_serializer_columns(FeeKindSerializer, FeeKind),
+            ('id', 'title'),
+        )
+
+    def test_method_field(self):
+        """Columns aren't detected when serializer has a method field."""
+        self.assertIsNone(
+            get_serializer_columns(FeeKindMethodSerializer, FeeKind)
+        )
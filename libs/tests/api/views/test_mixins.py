@@ -0,0 +1,140 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from apps.users.models import AppUser, FeeKind
+
+from ....api.views.mixins import (
+    CachedListMixin,
+    CachedRetrieveMixin,
+    get_etag,
+    invalidate_list_cache,
+    invalidate_object_cache,
+)
+
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+class CountingView(object):
+    """View which counts rendered responses instead of querying DB."""
+    queryset = FeeKind.objects.none()
+    lookup_field = 'pk'
+    lookup_url_kwarg = None
+
+    def __init__(self, pk=1):
+        self.kwargs = {'pk': pk}
+        self.calls = 0
+
+    def get_data(self):
+        self.calls += 1
+        return {'pk': self.kwargs['pk'], 'title': 'Flat Fee'}
+
+    def list(self, request, *args, **kwargs):
+        return Response([self.get_data()])
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_data())
+
+
+class CachedListView(CachedListMixin, CountingView):
+    pass
+
+
+class CachedRetrieveView(CachedRetrieveMixin, CountingView):
+    pass
+
+
+def make_request(user=None, **headers):
+    """Create DRF request with optional user and headers."""
+    request = Request(APIRequestFactory().get('/', **headers))
+    if user is not None:
+        request.user = user
+    return request
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCachedListMixin(TestCase):
+    """Tests for ``CachedListMixin``."""
+
+    def setUp(self):
+        cache.clear()
+        self.view = CachedListView()
+
+    def test_cached_response(self):
+        """Second request is served from cache with the same ``ETag``."""
+        first = self.view.list(make_request())
+        second = self.view.list(make_request())
+        self.assertEqual(self.view.calls, 1)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], get_etag(first.data))
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_not_modified(self):
+        """Request with matching ``If-None-Match`` gets ``304``."""
+        etag = self.view.list(make_request())['ETag']
+        response = self.view.list(make_request(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertIsNone(response.data)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_invalidation(self):
+        """List is rendered again after model cache is invalidated."""
+        key = self.view.get_list_cache_key(make_request())
+        self.view.list(make_request())
+        invalidate_list_cache(FeeKind)
+        self.assertNotEqual(self.view.get_list_cache_key(make_request()), key)
+        self.view.list(make_request())
+        self.assertEqual(self.view.calls, 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCachedRetrieveMixin(TestCase):
+    """Tests for ``CachedRetrieveMixin``."""
+
+    def setUp(self):
+        cache.clear()
+        self.view = CachedRetrieveView()
+
+    def test_not_modified(self):
+        """Request with matching ``If-None-Match`` gets ``304``."""
+        etag = self.view.retrieve(make_request())['ETag']
+        response = self.view.retrieve(make_request(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.view.calls, 1)
+
+    def test_invalidation(self):
+        """Object is rendered again after its cache is invalidated.
+
+        Cache of other objects of the same model is kept.
+
+        """
+        other_view = CachedRetrieveView(pk=2)
+        self.view.retrieve(make_request())
+        other_view.retrieve(make_request())
+        invalidate_object_cache(FeeKind, 1)
+        self.view.retrieve(make_request())
+        other_view.retrieve(make_request())
+        self.assertEqual(self.view.calls, 2)
+        self.assertEqual(other_view.calls, 1)
+
+    def test_key_per_user(self):
+        """Each user and anonymous requests are cached separately."""
+        first_user, second_user = AppUser(pk=1), AppUser(pk=2)
+        keys = {
+            self.view.get_retrieve_cache_key(make_request()),
+            self.view.get_retrieve_cache_key(make_request(first_user)),
+            self.view.get_retrieve_cache_key(make_request(second_user)),
+        }
+        self.assertEqual(len(keys), 3)
+
+        self.view.retrieve(make_request(first_user))
+        self.view.retrieve(make_request(second_user))
+        self.view.retrieve(make_request(first_user))
+        self.assertEqual(self.view.calls, 2)
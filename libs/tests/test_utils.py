@@ -0,0 +1,32 @@
+import uuid
+from unittest.mock import patch
+
+from ..utils import uuid7
+
+
+def test_uuid7_version_and_variant():
+    """Generated UUID has version 7 and RFC 4122 variant bits."""
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_timestamp():
+    """First 48 bits of UUID are unix time in milliseconds."""
+    with patch('libs.utils.time_ns', return_value=1_600_000_000_123_456_789):
+        value = uuid7()
+    assert value.int >> 80 == 1_600_000_000_123
+
+
+def test_uuid7_ordering():
+    """UUIDs generated in later milliseconds are greater.
+
+    Random bits don't affect order of UUIDs from different milliseconds.
+
+    """
+    start = 1_600_000_000_000
+    timestamps = [ms * 1_000_000 for ms in range(start, start + 50)]
+    with patch('libs.utils.time_ns', side_effect=timestamps):
+        values = [uuid7() for _ in timestamps]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)